@@ -4,7 +4,8 @@ def extract_text(
     input_path: str,
     output_path: str = None,
     recursive: bool = False,
-    file_types: list[str] = None
+    file_types: list[str] = None,
+    max_workers: int = 1
 ):
     """Extract text from documents.
     
@@ -13,6 +14,7 @@ def extract_text(
         output_path: Optional path to write JSON output
         recursive: Whether to recursively search directories
         file_types: List of file types to process
+        max_workers: Number of worker processes used for extraction
         
     Returns:
         Iterator of document results
@@ -22,5 +24,6 @@ def extract_text(
         input_path,
         output_path=output_path,
         recursive=recursive,
-        file_types=file_types
+        file_types=file_types,
+        max_workers=max_workers
     )
\ No newline at end of file
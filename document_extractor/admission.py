@@ -0,0 +1,252 @@
+"""
+Memory-aware admission control for concurrent extraction.
+"""
+
+import multiprocessing
+import os
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+_MIB = 1024 * 1024
+
+
+def current_rss(pid: Optional[int] = None) -> Optional[int]:
+    """Return the resident set size of a process in bytes.
+
+    Args:
+        pid: Process to measure; defaults to the current process
+
+    Returns:
+        int or None: Current RSS, or None where it cannot be measured
+    """
+    try:
+        with open(f"/proc/{pid or 'self'}/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+def worker_pids() -> List[int]:
+    """Return the process ids of the live child processes, such as pool workers."""
+    return [process.pid for process in multiprocessing.active_children()]
+
+
+def peak_rss() -> Optional[int]:
+    """Return the peak resident set size of the current process in bytes."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in kilobytes on Linux and in bytes on macOS
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def reset_high_water() -> bool:
+    """Reset the process's RSS high-water mark so it covers only what follows.
+
+    Returns:
+        bool: True if the mark was reset (Linux), False where unsupported
+    """
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def high_water_rss() -> Optional[int]:
+    """Return the RSS high-water mark since the last reset in bytes, or None if unavailable."""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+def measure_usage(func, *args) -> Tuple[Any, Dict[str, Optional[int]]]:
+    """Call ``func`` and report the memory it used in this process.
+
+    Returns:
+        Tuple of the function result and a usage dictionary with the process
+        ``pid``, its ``rss`` afterwards and the ``peak_delta`` observed while
+        the call ran. ``peak_delta`` is None when the call's peak could not be
+        measured, so it is never mistaken for a call that used no memory.
+    """
+    rss_before = current_rss()
+    resettable = reset_high_water()
+    peak_before = None if resettable else peak_rss()
+    result = func(*args)
+    rss_after = current_rss()
+
+    peak = None
+    if resettable:
+        peak = high_water_rss()
+    else:
+        # ru_maxrss is a lifetime peak: it only describes this call when the
+        # call set a new one. Memory reused from an earlier, larger document
+        # leaves it unchanged, and the RSS afterwards says nothing about what
+        # was allocated and freed in between.
+        peak_after = peak_rss()
+        if peak_before is not None and peak_after is not None and peak_after > peak_before:
+            peak = peak_after
+
+    peak_delta = None
+    if rss_before is not None and peak is not None:
+        peak_delta = max(peak - rss_before, 0)
+    return result, {"pid": os.getpid(), "rss": rss_after, "peak_delta": peak_delta}
+
+
+class AdmissionController:
+    """Admits documents for concurrent extraction while projected memory stays under a budget.
+
+    Each document's peak memory is estimated as a fixed overhead plus a
+    per-type multiple of its file size. The multiples are calibrated against
+    the peak RSS growth that workers report after each document, and new work
+    is held back while the live RSS of this process and its workers is above
+    the high-water mark. A document is always admitted when nothing else is in
+    flight, so oversized files are processed alone instead of stalling the run.
+    """
+
+    # Incremental peak memory per byte of input, before calibration
+    DEFAULT_FACTORS = {"pdf": 3.0, "pptx": 6.0, "docx": 4.0}
+    FALLBACK_FACTOR = 6.0
+    BASE_OVERHEAD = 16 * _MIB
+    # Files smaller than this are dominated by fixed overhead and do not
+    # say much about the per-byte factor.
+    MIN_CALIBRATION_SIZE = _MIB
+
+    def __init__(
+        self,
+        memory_budget: int,
+        high_water: Optional[int] = None,
+        smoothing: float = 0.3
+    ):
+        """Initialize the admission controller.
+
+        Args:
+            memory_budget: Total memory in bytes that in-flight work may use
+            high_water: Measured RSS in bytes above which admission pauses;
+                defaults to 90% of the budget
+            smoothing: Weight given to each new observation when calibrating
+        """
+        self.memory_budget = memory_budget
+        self.high_water = high_water if high_water is not None else int(memory_budget * 0.9)
+        self.smoothing = smoothing
+        self.factors = dict(self.DEFAULT_FACTORS)
+        self.deferred = 0
+        self.peak_measured = 0
+        self._in_flight: Dict[Any, Tuple[int, str, int]] = {}
+        self._worker_rss: Dict[int, int] = {}
+
+    def reset_workers(self) -> None:
+        """Forget RSS reported by workers of a previous pool."""
+        self._worker_rss.clear()
+
+    def estimate(self, file_type: str, size: int) -> int:
+        """Estimate peak memory in bytes for extracting a document."""
+        factor = self.factors.get(file_type, self.FALLBACK_FACTOR)
+        return self.BASE_OVERHEAD + int(size * factor)
+
+    def estimate_path(
+        self,
+        path: Path,
+        file_type: Optional[str] = None,
+        stats: Optional[os.stat_result] = None
+    ) -> Tuple[str, int, int]:
+        """Return the file type, size and memory estimate for ``path``.
+
+        Args:
+            path: Path to the document
+            file_type: Type detected from the content; defaults to the suffix
+            stats: Stat result already obtained for the file; without it the
+                file is stat'ed here
+        """
+        file_type = file_type or path.suffix.lstrip('.').lower()
+        try:
+            size = (stats or path.stat()).st_size
+        except OSError:
+            size = 0
+        return file_type, size, self.estimate(file_type, size)
+
+    def measured(self) -> int:
+        """Return the RSS of this process and all live workers.
+
+        Workers are measured while they run, so a worker growing on a large
+        document holds back admission before it finishes. Where a worker's
+        RSS cannot be read, the value it reported with its last document is
+        used instead.
+        """
+        total = current_rss() or 0
+        for pid in worker_pids():
+            rss = current_rss(pid)
+            total += rss if rss is not None else self._worker_rss.get(pid, 0)
+        return total
+
+    def projected(self) -> int:
+        """Return measured RSS plus the estimates of all in-flight documents."""
+        return self.measured() + sum(estimate for estimate, _, _ in self._in_flight.values())
+
+    def can_admit(self, estimate: int) -> bool:
+        """Return True if a document with the given estimate may start now.
+
+        Every refusal is counted in ``deferred``.
+        """
+        if not self._in_flight:
+            return True
+        measured = self.measured()
+        self.peak_measured = max(self.peak_measured, measured)
+        if measured >= self.high_water or self.projected() + estimate > self.memory_budget:
+            self.deferred += 1
+            return False
+        return True
+
+    def admit(self, token: Any, file_type: str, size: int, estimate: int) -> None:
+        """Record that the document identified by ``token`` has started."""
+        self._in_flight[token] = (estimate, file_type, size)
+
+    def release(self, token: Any, usage: Optional[Dict[str, Optional[int]]] = None) -> None:
+        """Record that a document finished and calibrate from its measured usage.
+
+        Args:
+            token: Token previously passed to ``admit``
+            usage: Usage dictionary produced by ``measure_usage``
+        """
+        _, file_type, size = self._in_flight.pop(token)
+        if not usage:
+            return
+        if usage.get("rss") is not None:
+            self._worker_rss[usage["pid"]] = usage["rss"]
+            self.peak_measured = max(self.peak_measured, self.measured())
+        if usage.get("peak_delta") is not None:
+            self.calibrate(file_type, size, usage["peak_delta"])
+
+    def calibrate(self, file_type: str, size: int, peak_delta: int) -> None:
+        """Update the per-type memory factor from an observed peak.
+
+        ``peak_delta`` must be the measured peak of the call itself; callers
+        skip calls whose peak ``measure_usage`` could not measure.
+        """
+        if size < self.MIN_CALIBRATION_SIZE:
+            return
+        observed = max(peak_delta - self.BASE_OVERHEAD, 0) / size
+        current = self.factors.get(file_type, self.FALLBACK_FACTOR)
+        self.factors[file_type] = (1 - self.smoothing) * current + self.smoothing * observed
+
+    def stats(self) -> Dict[str, Any]:
+        """Return counters describing admission decisions so far."""
+        return {
+            "memory_budget": self.memory_budget,
+            "high_water": self.high_water,
+            "deferred": self.deferred,
+            "peak_measured_rss": self.peak_measured,
+            "factors": {key: round(value, 3) for key, value in self.factors.items()},
+        }
@@ -0,0 +1,488 @@
+"""
+Command-line batch runner (``text-gremlin``).
+
+Reads a directory, or a newline/NUL-delimited list of paths, and streams one
+JSON record per document (NDJSON). A machine-readable end-of-run summary is
+written to stderr (or ``--summary FILE``) and reflected in the exit code.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Any, BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional, TextIO
+
+from .admission import AdmissionController
+from .estimate import DEFAULT_WORKER_COUNTS, CostEstimator, load_calibration
+from .models import ExtractionBudget
+from .processor import DocumentProcessor
+from .store import OutputStore
+
+EXIT_OK = 0
+EXIT_FAILURES = 1
+EXIT_USAGE = 2
+
+_SIZE_UNITS = {"": 1, "K": 1024, "M": 1024 ** 2, "G": 1024 ** 3, "T": 1024 ** 4}
+
+
+def parse_size(value: str) -> int:
+    """Parse a byte size such as ``512``, ``64K``, ``10M`` or ``1.5G``.
+
+    Args:
+        value: Size string with an optional K/M/G/T suffix (powers of 1024)
+
+    Returns:
+        int: Size in bytes
+
+    Raises:
+        argparse.ArgumentTypeError: If the value cannot be parsed
+    """
+    text = value.strip().upper().rstrip("B")
+    unit = text[-1:] if text[-1:] in _SIZE_UNITS else ""
+    number = text[:-1] if unit else text
+    try:
+        size = int(float(number) * _SIZE_UNITS[unit])
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Invalid size: {value}")
+    if size < 0:
+        raise argparse.ArgumentTypeError(f"Invalid size: {value}")
+    return size
+
+
+def positive_int(value: str) -> int:
+    """Parse an integer that must be at least 1.
+
+    Raises:
+        argparse.ArgumentTypeError: If the value is not a positive integer
+    """
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Invalid number: {value}")
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"Must be at least 1: {value}")
+    return number
+
+
+def non_negative_int(value: str) -> int:
+    """Parse an integer that must be at least 0.
+
+    Raises:
+        argparse.ArgumentTypeError: If the value is not a non-negative integer
+    """
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Invalid number: {value}")
+    if number < 0:
+        raise argparse.ArgumentTypeError(f"Must be at least 0: {value}")
+    return number
+
+
+def positive_size(value: str) -> int:
+    """Parse a byte size like ``parse_size`` that must be at least 1 byte."""
+    size = parse_size(value)
+    if size < 1:
+        raise argparse.ArgumentTypeError(f"Must be at least 1 byte: {value}")
+    return size
+
+
+def read_path_list(stream: BinaryIO, null: bool = False, chunk_size: int = 65536) -> Iterator[str]:
+    """Lazily read a newline- or NUL-delimited path list.
+
+    Args:
+        stream: Binary stream to read from
+        null: Split on NUL bytes (``find -print0``) instead of newlines
+        chunk_size: Number of bytes read per call
+
+    Yields:
+        Each non-empty path, decoded with the filesystem encoding
+    """
+    separator = b"\0" if null else b"\n"
+    buffer = b""
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            break
+        buffer += chunk
+        *entries, buffer = buffer.split(separator)
+        for entry in entries:
+            if not null:
+                entry = entry.rstrip(b"\r")
+            if entry:
+                yield os.fsdecode(entry)
+    if not null:
+        buffer = buffer.rstrip(b"\r")
+    if buffer:
+        yield os.fsdecode(buffer)
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="text-gremlin",
+        description="Extract text from PDF, PPTX and DOCX files as NDJSON.",
+    )
+    parser.add_argument(
+        "input", nargs="?",
+        help="File or directory to process. Omit or use '-' to read a path list from stdin.",
+    )
+    parser.add_argument(
+        "-T", "--files-from", metavar="FILE",
+        help="Read the path list from FILE ('-' for stdin) instead of discovering files.",
+    )
+    parser.add_argument(
+        "-0", "--null", action="store_true",
+        help="Path list entries are NUL-delimited (as produced by find -print0).",
+    )
+    parser.add_argument(
+        "-r", "--recursive", action="store_true",
+        help="Recurse into subdirectories when INPUT is a directory.",
+    )
+    parser.add_argument(
+        "-t", "--types", metavar="TYPES",
+        help="Comma-separated file types to process (default: pdf,pptx,docx).",
+    )
+    parser.add_argument(
+        "-j", "--workers", type=int, default=1, metavar="N",
+        help="Number of worker processes (default: 1).",
+    )
+    parser.add_argument(
+        "--max-file-size", type=parse_size, metavar="SIZE",
+        help="Report files larger than SIZE (e.g. 200M) as errors instead of extracting them.",
+    )
+    parser.add_argument(
+        "--memory-budget", type=parse_size, metavar="SIZE",
+        help="Only start new documents while projected memory use stays under SIZE (e.g. 8G).",
+    )
+    parser.add_argument(
+        "--memory-high-water", type=parse_size, metavar="SIZE",
+        help="Pause admission while measured RSS is above SIZE (default: 90%% of --memory-budget).",
+    )
+    parser.add_argument(
+        "--max-pages", type=positive_int, metavar="N",
+        help="Stop extracting after N PDF pages or PPTX slides and flag the record as truncated.",
+    )
+    parser.add_argument(
+        "--max-chars", type=positive_int, metavar="N",
+        help="Truncate extracted content to N characters.",
+    )
+    parser.add_argument(
+        "--max-bytes", type=positive_size, metavar="SIZE",
+        help="Truncate extracted content to SIZE bytes of UTF-8.",
+    )
+    parser.add_argument(
+        "--hash", action="store_true",
+        help="Add the SHA-256 of each file (file_sha256), computed from the bytes already read for parsing.",
+    )
+    parser.add_argument(
+        "--detect-types", action="store_true",
+        help="Identify documents by content instead of suffix, so renamed and extensionless "
+             "files are extracted and non-documents are skipped.",
+    )
+    parser.add_argument(
+        "--type-cache", metavar="FILE",
+        help="With --detect-types, reuse detected types from FILE for files whose size, "
+             "inode and modification time are unchanged, and save them back after the run.",
+    )
+    parser.add_argument(
+        "--triage", action="store_true",
+        help="Report type, size, page/slide count and whether each file opens, without extracting text.",
+    )
+    parser.add_argument(
+        "--dry-run", action="store_true",
+        help="Estimate runtime per worker count, peak memory and output size instead of extracting.",
+    )
+    parser.add_argument(
+        "--sample", type=non_negative_int, default=0, metavar="N",
+        help="With --dry-run, extract N randomly chosen documents to calibrate the estimate.",
+    )
+    parser.add_argument(
+        "--calibration", metavar="FILE",
+        help="With --dry-run, calibrate from the NDJSON or JSON output of a previous run.",
+    )
+    parser.add_argument(
+        "--seed", type=int, metavar="N",
+        help="Random seed for --sample.",
+    )
+    parser.add_argument(
+        "--store", metavar="DIR",
+        help="Also record the run as a new version in the versioned output store at DIR. "
+             "Directory runs only tombstone documents within the scanned directory, recursion "
+             "and --types scope; path-list runs are recorded as partial updates without tombstones.",
+    )
+    parser.add_argument(
+        "-o", "--output", metavar="FILE",
+        help="Write NDJSON records to FILE instead of stdout.",
+    )
+    parser.add_argument(
+        "--summary", metavar="FILE",
+        help="Write the end-of-run JSON summary to FILE instead of stderr.",
+    )
+    return parser
+
+
+def _open_path_list(args: argparse.Namespace) -> Optional[BinaryIO]:
+    """Return the binary stream holding the path list, or None for directory mode."""
+    source = args.files_from
+    if source is None and args.input in (None, "-"):
+        source = "-"
+    if source is None:
+        return None
+    if source == "-":
+        return sys.stdin.buffer
+    return open(source, "rb")
+
+
+def _write_summary(summary: dict, target: Optional[str]) -> None:
+    line = json.dumps(summary)
+    if target:
+        Path(target).parent.mkdir(parents=True, exist_ok=True)
+        Path(target).write_text(line + "\n", encoding="utf-8")
+    else:
+        print(line, file=sys.stderr)
+
+
+def scan_scope(
+    input_path: Path,
+    recursive: bool,
+    file_types: Optional[List[str]] = None
+) -> Callable[[Dict[str, Any]], bool]:
+    """Return a predicate telling whether a stored document falls within a directory scan.
+
+    A document is in scope when it lies under ``input_path`` (directly, unless
+    ``recursive``) and its type is one of ``file_types``, so a store commit
+    only tombstones documents the scan could have found.
+    """
+    root = input_path.absolute()
+    single_file = root.is_file()
+    supported_types = set(file_types) if file_types else {"pdf", "pptx", "docx"}
+
+    def in_scope(entry: Dict[str, Any]) -> bool:
+        if entry.get("file_type") not in supported_types:
+            return False
+        path = Path(entry["file_path"])
+        if single_file:
+            return path == root
+        return root in path.parents if recursive else path.parent == root
+
+    return in_scope
+
+
+def run(
+    processor: DocumentProcessor,
+    paths: Iterable[str],
+    output: TextIO,
+    file_types: Optional[List[str]] = None,
+    max_workers: int = 1,
+    triage: bool = False,
+    store: Optional[OutputStore] = None,
+    partial: bool = False,
+    scope: Optional[Callable[[Dict[str, Any]], bool]] = None,
+    discovered: bool = False
+) -> dict:
+    """Process ``paths`` and write one NDJSON record per document to ``output``.
+
+    Args:
+        triage: Write structural metadata records instead of extracted text
+        store: Optional output store that records the run as a new version
+        partial: ``paths`` is a subset of the corpus, so the store must not
+            tombstone documents missing from it
+        scope: Predicate limiting which stored documents missing from the
+            run are tombstoned (see ``scan_scope``)
+        discovered: ``paths`` holds the ``(path, stat)`` pairs yielded by
+            ``DocumentProcessor._discover``, so their stat results are reused
+
+    Returns:
+        dict: Run summary with document counts and elapsed time
+    """
+    start = time.monotonic()
+    counts = {"read": 0, "documents": 0, "succeeded": 0, "failed": 0, "truncated": 0}
+
+    def counted(items: Iterable[str]) -> Iterator[str]:
+        for item in items:
+            counts["read"] += 1
+            yield item
+
+    def emitted(docs: Iterable[dict]) -> Iterator[dict]:
+        for doc in docs:
+            output.write(json.dumps(doc) + "\n")
+            counts["documents"] += 1
+            counts["failed" if doc["error"] else "succeeded"] += 1
+            counts["truncated"] += bool(doc.get("truncated"))
+            yield doc
+
+    method = "_inspect_single_document" if triage else "_process_single_document"
+    records = emitted(processor._map_paths(counted(paths), file_types, max_workers, method, discovered=discovered))
+    version = None
+    if store is not None:
+        version = store.commit(records, partial=partial, scope=scope)
+    else:
+        for _ in records:
+            pass
+
+    failed = counts["failed"]
+    summary = {
+        "documents": counts["documents"],
+        "succeeded": counts["succeeded"],
+        "failed": failed,
+        "skipped": counts["read"] - counts["documents"],
+        "truncated": counts["truncated"],
+        "elapsed_seconds": round(time.monotonic() - start, 3),
+        "exit_code": EXIT_FAILURES if failed else EXIT_OK,
+    }
+    if processor.io_counters:
+        summary["io"] = dict(processor.io_counters)
+    if processor.pool_restarts:
+        summary["worker_pool_restarts"] = processor.pool_restarts
+    if processor.admission and max_workers > 1:
+        summary["admission"] = processor.admission.stats()
+    if store is not None:
+        summary["store"] = {"version": version, **store.last_commit_stats}
+    if processor.sniffer is not None:
+        summary["type_detection"] = {"cache_hits": processor.sniffer.hits, "cache_misses": processor.sniffer.misses}
+    return summary
+
+
+def dry_run(
+    processor: DocumentProcessor,
+    paths: Iterable[str],
+    output: TextIO,
+    file_types: Optional[List[str]] = None,
+    max_workers: int = 1,
+    sample_size: int = 0,
+    calibration: Optional[List[Dict[str, Any]]] = None,
+    seed: Optional[int] = None,
+    discovered: bool = False
+) -> dict:
+    """Write a cost estimate for ``paths`` to ``output`` without extracting them.
+
+    Args:
+        sample_size: Number of documents to extract first for calibration
+        calibration: Records from a previous run, as returned by ``load_calibration``
+        discovered: ``paths`` holds ``(path, stat)`` pairs from
+            ``DocumentProcessor._discover``, already filtered by type
+
+    Returns:
+        dict: Run summary
+    """
+    start = time.monotonic()
+    supported_types = set(file_types) if file_types else {"pdf", "pptx", "docx"}
+    if discovered:
+        selected = [path for path, _ in paths]
+    else:
+        selected = [Path(p) for p in paths if processor._document_type(Path(p)) in supported_types]
+
+    estimator = CostEstimator(processor)
+    if calibration:
+        estimator.add_samples(calibration)
+    sampled = estimator.sample(selected, sample_size, seed=seed) if sample_size else 0
+    worker_counts = sorted(set(DEFAULT_WORKER_COUNTS) | {max_workers})
+    estimate = estimator.estimate(selected, worker_counts=worker_counts)
+    output.write(json.dumps(estimate, indent=2) + "\n")
+
+    return {
+        "documents": estimate["documents"],
+        "sampled": sampled,
+        "calibration_samples": estimate["calibration_samples"],
+        "elapsed_seconds": round(time.monotonic() - start, 3),
+        "exit_code": EXIT_OK,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Entry point for the ``text-gremlin`` command.
+
+    Returns:
+        int: EXIT_OK if every document was extracted, EXIT_FAILURES if any
+        document failed; usage errors exit with EXIT_USAGE via argparse
+    """
+    parser = _build_parser()
+    args = parser.parse_args(argv)
+
+    if args.files_from is not None and args.input not in (None, "-"):
+        parser.error("INPUT cannot be combined with --files-from")
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if args.memory_high_water is not None and args.memory_budget is None:
+        parser.error("--memory-high-water requires --memory-budget")
+    if (args.sample or args.calibration) and not args.dry_run:
+        parser.error("--sample and --calibration require --dry-run")
+    if args.store and (args.triage or args.dry_run):
+        parser.error("--store cannot be combined with --triage or --dry-run")
+    if args.type_cache and not args.detect_types:
+        parser.error("--type-cache requires --detect-types")
+    file_types = [t.strip().lstrip(".").lower() for t in args.types.split(",") if t.strip()] if args.types else None
+    budget = None
+    if any(limit is not None for limit in (args.max_pages, args.max_chars, args.max_bytes)):
+        budget = ExtractionBudget(max_pages=args.max_pages, max_chars=args.max_chars, max_bytes=args.max_bytes)
+    admission = None
+    if args.memory_budget is not None:
+        admission = AdmissionController(args.memory_budget, high_water=args.memory_high_water)
+    processor = DocumentProcessor(
+        max_file_size=args.max_file_size, budget=budget, admission=admission, hash_files=args.hash,
+        detect_types=args.detect_types
+    )
+    if args.type_cache:
+        try:
+            processor.sniffer.load(args.type_cache)
+        except (OSError, ValueError) as e:
+            parser.error(f"cannot read type cache: {e}")
+
+    calibration = None
+    if args.calibration:
+        try:
+            calibration = load_calibration(args.calibration)
+        except (OSError, ValueError) as e:
+            parser.error(f"cannot read calibration file: {e}")
+
+    try:
+        path_list = _open_path_list(args)
+    except OSError as e:
+        parser.error(f"cannot read path list: {e}")
+
+    if path_list is None:
+        input_path = Path(args.input)
+        if not input_path.exists():
+            parser.error(f"input path does not exist: {input_path}")
+        paths = processor._discover(input_path, args.recursive, file_types)
+    else:
+        paths = read_path_list(path_list, null=args.null)
+
+    if args.output:
+        Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+    output = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    try:
+        if args.dry_run:
+            summary = dry_run(
+                processor, paths, output,
+                file_types=file_types, max_workers=args.workers,
+                sample_size=args.sample, calibration=calibration, seed=args.seed,
+                discovered=path_list is None
+            )
+        else:
+            summary = run(
+                processor, paths, output,
+                file_types=file_types, max_workers=args.workers, triage=args.triage,
+                store=OutputStore(args.store) if args.store else None,
+                partial=path_list is not None,
+                scope=scan_scope(input_path, args.recursive, file_types) if path_list is None else None,
+                discovered=path_list is None
+            )
+    except BrokenPipeError:
+        # The reader closed the pipe (e.g. `| head`): stop quietly like other
+        # filters, and point stdout at devnull so the final flush at exit
+        # does not fail again.
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return EXIT_FAILURES
+    finally:
+        if output is not sys.stdout:
+            output.close()
+        if path_list is not None and path_list is not sys.stdin.buffer:
+            path_list.close()
+
+    if args.type_cache:
+        processor.sniffer.save(args.type_cache)
+    _write_summary(summary, args.summary)
+    return summary["exit_code"]
@@ -0,0 +1,311 @@
+"""
+Dry-run cost estimation for extraction jobs.
+
+Predicts runtime per worker count, peak memory and output size from file
+stat data alone, calibrated with timing records from a previous run (the
+NDJSON records or ``{"documents": [...]}`` JSON written by this package) and
+optionally from a small random sample run through the real extractors.
+"""
+
+import json
+import math
+import random
+import statistics
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Union
+
+from .admission import AdmissionController, measure_usage
+from .processor import DocumentProcessor
+
+_MIB = 1024 * 1024
+
+# Uncalibrated per-type cost model: fixed seconds per document, seconds per
+# MiB of input and UTF-8 content bytes produced per input byte.
+DEFAULT_MODELS = {
+    "pdf": {"overhead": 0.02, "seconds_per_mib": 0.25, "content_ratio": 0.05},
+    "pptx": {"overhead": 0.15, "seconds_per_mib": 0.05, "content_ratio": 0.01},
+    "docx": {"overhead": 0.05, "seconds_per_mib": 0.10, "content_ratio": 0.20},
+}
+FALLBACK_MODEL = {"overhead": 0.1, "seconds_per_mib": 0.25, "content_ratio": 0.05}
+
+DEFAULT_WORKER_COUNTS = (1, 2, 4, 8)
+# Range applied to a factor that has fewer than two calibration samples
+UNCALIBRATED_RANGE = (0.5, 2.0)
+PROCESS_BASELINE = 60 * _MIB
+POOL_STARTUP_SECONDS = 0.5
+# Serialized record size excluding content and path, and the expansion of
+# content by JSON escaping
+RECORD_OVERHEAD = {"ndjson": 330, "json": 380}
+ESCAPE_FACTOR = 1.1
+
+
+def load_calibration(path: Union[str, Path]) -> List[Dict[str, Any]]:
+    """Load timing records from a previous run.
+
+    Args:
+        path: NDJSON file written by the CLI or JSON file written by
+            ``process_documents``
+
+    Returns:
+        List of records that carry ``file_size`` and ``duration_seconds``
+
+    Raises:
+        OSError: If the file cannot be read
+        ValueError: If the file is not JSON/NDJSON or holds non-record values
+    """
+    text = Path(path).read_text(encoding="utf-8")
+    try:
+        data = json.loads(text)
+    except json.JSONDecodeError:
+        records = [json.loads(line) for line in text.splitlines() if line.strip()]
+    else:
+        if isinstance(data, dict):
+            # A single-record NDJSON file parses as one record
+            records = data["documents"] if "documents" in data else [data]
+        else:
+            records = data
+    if not isinstance(records, list) or not all(isinstance(record, dict) for record in records):
+        raise ValueError(f"Not a file of extraction records: {path}")
+    return [
+        record for record in records
+        if record.get("file_size") and record.get("duration_seconds") is not None and not record.get("error")
+    ]
+
+
+class _Factor:
+    """Multiplicative correction of a default prediction with a confidence range."""
+
+    def __init__(self):
+        self.ratios: List[float] = []
+
+    def add(self, observed: float, predicted: float) -> None:
+        if predicted > 0:
+            self.ratios.append(observed / predicted)
+
+    def range(self) -> Dict[str, float]:
+        if len(self.ratios) < 2:
+            mean = self.ratios[0] if self.ratios else 1.0
+            return {"estimate": mean, "low": mean * UNCALIBRATED_RANGE[0], "high": mean * UNCALIBRATED_RANGE[1]}
+        mean = statistics.fmean(self.ratios)
+        margin = 1.96 * statistics.stdev(self.ratios) / math.sqrt(len(self.ratios))
+        return {"estimate": mean, "low": max(mean - margin, 0.0), "high": mean + margin}
+
+
+class CostEstimator:
+    """Estimates runtime, memory and output size of an extraction job."""
+
+    def __init__(self, processor: Optional[DocumentProcessor] = None):
+        """Initialize the estimator.
+
+        Args:
+            processor: Processor used for discovery and sample extraction
+        """
+        self.processor = processor or DocumentProcessor()
+        # Supplies the default per-type memory model; sampled peaks correct it
+        # through ``_memory`` so they also yield a confidence range.
+        self.memory = AdmissionController(memory_budget=0)
+        self._time: Dict[str, _Factor] = {}
+        self._content: Dict[str, _Factor] = {}
+        self._memory: Dict[str, _Factor] = {}
+
+    @staticmethod
+    def _model(file_type: str) -> Dict[str, float]:
+        return DEFAULT_MODELS.get(file_type, FALLBACK_MODEL)
+
+    def _predict_seconds(self, file_type: str, size: int) -> float:
+        model = self._model(file_type)
+        return model["overhead"] + model["seconds_per_mib"] * size / _MIB
+
+    def _predict_content(self, file_type: str, size: int) -> float:
+        return self._model(file_type)["content_ratio"] * size
+
+    def add_samples(self, records: Iterable[Dict[str, Any]]) -> int:
+        """Calibrate from extraction records with timing data.
+
+        Args:
+            records: Result dictionaries with ``file_type``, ``file_size``,
+                ``duration_seconds`` and ``content``
+
+        Returns:
+            int: Number of records used
+        """
+        used = 0
+        for record in records:
+            file_type, size = record["file_type"], record["file_size"]
+            self._time.setdefault(file_type, _Factor()).add(
+                record["duration_seconds"], self._predict_seconds(file_type, size)
+            )
+            content = record.get("content") or ""
+            self._content.setdefault(file_type, _Factor()).add(
+                len(content.encode("utf-8")), self._predict_content(file_type, size)
+            )
+            used += 1
+        return used
+
+    def sample(self, paths: Sequence[Path], sample_size: int, seed: Optional[int] = None) -> int:
+        """Run a random subset of ``paths`` through the real extractors and calibrate.
+
+        Returns:
+            int: Number of documents successfully sampled
+        """
+        chosen = random.Random(seed).sample(list(paths), min(sample_size, len(paths)))
+        records = []
+        for path in chosen:
+            result, usage = measure_usage(self.processor._process_single_document, path)
+            if result.error or not result.file_size:
+                continue
+            records.append(result.to_dict())
+            if usage["peak_delta"] is not None:
+                self._memory.setdefault(result.file_type, _Factor()).add(
+                    usage["peak_delta"], self.memory.estimate(result.file_type, result.file_size)
+                )
+        return self.add_samples(records)
+
+    def estimate(
+        self,
+        paths: Iterable[Union[str, Path]],
+        worker_counts: Sequence[int] = DEFAULT_WORKER_COUNTS
+    ) -> Dict[str, Any]:
+        """Predict the cost of extracting ``paths`` from stat data.
+
+        Args:
+            paths: Documents to estimate
+            worker_counts: Worker process counts to predict runtime and memory for
+
+        Returns:
+            Dictionary with totals, per-type breakdowns, runtime and peak memory
+            per worker count and output size per format; ranges have
+            ``estimate``, ``low`` and ``high`` values
+        """
+        per_type: Dict[str, Dict[str, Any]] = {}
+        time_factors: Dict[str, Dict[str, float]] = {}
+        memory_estimates: Dict[str, List[float]] = {"estimate": [], "low": [], "high": []}
+        memory_factors: Dict[str, Dict[str, float]] = {}
+        longest = {"estimate": 0.0, "low": 0.0, "high": 0.0}
+        path_bytes = 0
+
+        for path in map(Path, paths):
+            # The processor's type is the detected one when it sniffs content;
+            # a stat taken to sniff it is reused for the size
+            file_type, stats = self.processor._select(path)
+            if file_type not in self.processor.extractors:
+                file_type = path.suffix.lstrip('.').lower()
+            if stats is None:
+                stats = self.processor._stat(path)
+                if stats is None:
+                    continue
+            size = stats.st_size
+            totals = per_type.setdefault(file_type, {"documents": 0, "bytes": 0, "seconds": 0.0, "content": 0.0})
+            totals["documents"] += 1
+            totals["bytes"] += size
+            seconds = self._predict_seconds(file_type, size)
+            totals["seconds"] += seconds
+            totals["content"] += self._predict_content(file_type, size)
+            if file_type not in time_factors:
+                time_factors[file_type] = self._factor(self._time, file_type)
+            for key, factor in time_factors[file_type].items():
+                longest[key] = max(longest[key], seconds * factor)
+            if file_type not in memory_factors:
+                memory_factors[file_type] = self._factor(self._memory, file_type)
+            memory = self.memory.estimate(file_type, size)
+            for key, factor in memory_factors[file_type].items():
+                memory_estimates[key].append(memory * factor)
+            # The path appears in both file_path and file_name
+            path_bytes += len(str(path.absolute())) + len(path.name)
+
+        breakdown = {}
+        cpu = {"estimate": 0.0, "low": 0.0, "high": 0.0}
+        content = {"estimate": 0.0, "low": 0.0, "high": 0.0}
+        for file_type, totals in sorted(per_type.items()):
+            time_factor = time_factors[file_type]
+            content_factor = self._factor(self._content, file_type)
+            type_cpu = {key: totals["seconds"] * value for key, value in time_factor.items()}
+            type_content = {key: totals["content"] * value for key, value in content_factor.items()}
+            for key in cpu:
+                cpu[key] += type_cpu[key]
+                content[key] += type_content[key]
+            breakdown[file_type] = {
+                "documents": totals["documents"],
+                "bytes": totals["bytes"],
+                "cpu_seconds": _rounded(type_cpu),
+                "content_bytes": _rounded(type_content),
+                "calibration_samples": len(self._time.get(file_type, _Factor()).ratios),
+            }
+
+        documents = sum(totals["documents"] for totals in per_type.values())
+        for values in memory_estimates.values():
+            values.sort(reverse=True)
+        runtime = {}
+        peak_memory = {}
+        for workers in worker_counts:
+            # Workers beyond the number of documents stay idle
+            active = min(workers, documents)
+            startup = POOL_STARTUP_SECONDS if active > 1 else 0.0
+            runtime[str(workers)] = _rounded({
+                key: max(value / max(active, 1), longest[key]) + startup
+                for key, value in cpu.items()
+            })
+            pool = active * PROCESS_BASELINE if active > 1 else 0
+            peak_memory[str(workers)] = {
+                key: int(PROCESS_BASELINE + pool + sum(values[:active]))
+                for key, values in memory_estimates.items()
+            }
+
+        output = {
+            fmt: _rounded({
+                key: value * ESCAPE_FACTOR + documents * RECORD_OVERHEAD[fmt] + path_bytes
+                for key, value in content.items()
+            })
+            for fmt in RECORD_OVERHEAD
+        }
+
+        return {
+            "documents": documents,
+            "bytes": sum(totals["bytes"] for totals in per_type.values()),
+            "per_type": breakdown,
+            "cpu_seconds": _rounded(cpu),
+            "runtime_seconds": runtime,
+            "peak_memory_bytes": peak_memory,
+            "output_bytes": output,
+            "calibration_samples": sum(len(factor.ratios) for factor in self._time.values()),
+        }
+
+    @staticmethod
+    def _factor(factors: Dict[str, _Factor], file_type: str) -> Dict[str, float]:
+        return factors.get(file_type, _Factor()).range()
+
+
+def _rounded(values: Dict[str, float]) -> Dict[str, float]:
+    return {key: round(value, 3) for key, value in values.items()}
+
+
+def estimate_corpus(
+    input_path: str,
+    recursive: bool = False,
+    file_types: Optional[List[str]] = None,
+    sample_size: int = 0,
+    calibration: Optional[Iterable[Dict[str, Any]]] = None,
+    worker_counts: Sequence[int] = DEFAULT_WORKER_COUNTS,
+    seed: Optional[int] = None
+) -> Dict[str, Any]:
+    """Estimate the cost of extracting documents under ``input_path`` without running the job.
+
+    Args:
+        input_path: Path to file or directory to estimate
+        recursive: Whether to recursively search directories
+        file_types: List of file types to include
+        sample_size: Number of randomly chosen documents to extract for calibration
+        calibration: Timing records from a previous run (see ``load_calibration``)
+        worker_counts: Worker process counts to predict runtime and memory for
+        seed: Random seed for sample selection
+
+    Returns:
+        Dictionary of estimates as returned by ``CostEstimator.estimate``
+    """
+    estimator = CostEstimator()
+    paths = list(estimator.processor._find_documents(Path(input_path), recursive, file_types))
+    if calibration:
+        estimator.add_samples(calibration)
+    if sample_size:
+        estimator.sample(paths, sample_size, seed=seed)
+    return estimator.estimate(paths, worker_counts=worker_counts)
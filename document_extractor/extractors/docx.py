@@ -1,53 +1,132 @@
+import zipfile
 from pathlib import Path
-from typing import Union
+from typing import Optional, Union
+from xml.etree import ElementTree
 from docx import Document
 from docx.opc.exceptions import PackageNotFoundError
 
-from ..models import DocumentResult
+from ..fileio import FileContext, open_context
+from ..models import DocumentResult, DocumentInfo, ExtractionBudget
+
+_DOCUMENT_PART = "word/document.xml"
+_APP_PROPERTIES_PART = "docProps/app.xml"
+_PAGES_TAG = "{http://schemas.openxmlformats.org/officeDocument/2006/extended-properties}Pages"
 
 class DOCXExtractor:
     """Extractor for DOCX files using python-docx."""
     
     @staticmethod
-    def extract(file_path: Union[str, Path]) -> DocumentResult:
+    def extract(
+        file_path: Union[str, Path, FileContext],
+        budget: Optional[ExtractionBudget] = None
+    ) -> DocumentResult:
         """Extract text content from a DOCX file.
         
         Args:
-            file_path: Path to the DOCX file
+            file_path: Path to the DOCX file, or a FileContext whose
+                already-read bytes are parsed in memory
+            budget: Optional character/byte limits; extraction stops early and
+                the result is flagged as truncated when exceeded
             
         Returns:
             DocumentResult containing the extracted text and metadata
         """
-        file_path = Path(file_path)
+        owns_context = not isinstance(file_path, FileContext)
+        ctx = open_context(file_path)
+        file_path = ctx.path
         
         try:
-            if not file_path.exists():
+            try:
+                ctx.stat
+            except FileNotFoundError:
                 raise FileNotFoundError(f"File not found: {file_path}")
                 
-            if file_path.suffix.lower() != '.docx':
+            if ctx.file_type != 'docx':
                 raise ValueError(f"Not a DOCX file: {file_path}")
             
-            doc = Document(str(file_path))
+            budget = budget or ExtractionBudget()
+            doc = Document(ctx.stream())
+            chars = 0
+            truncated = False
             
             # Extract text from paragraphs
-            paragraphs = [paragraph.text for paragraph in doc.paragraphs if paragraph.text.strip()]
+            paragraphs = []
+            for paragraph in doc.paragraphs:
+                if budget.text_exhausted(chars):
+                    truncated = True
+                    break
+                if paragraph.text.strip():
+                    paragraphs.append(paragraph.text)
+                    chars += len(paragraph.text) + 2
             
             # Extract text from tables
             table_text = []
             for table in doc.tables:
+                if truncated or budget.text_exhausted(chars):
+                    truncated = True
+                    break
                 for row in table.rows:
+                    # A single table can be large enough to exceed the budget
+                    if budget.text_exhausted(chars):
+                        truncated = True
+                        break
                     cells = [cell.text.strip() for cell in row.cells if cell.text.strip()]
                     if cells:
                         table_text.append(" | ".join(cells))
+                        chars += len(table_text[-1]) + 2
             
             # Combine all text with appropriate spacing
             all_text = paragraphs + table_text
-            return DocumentResult.from_path(file_path, content="\n\n".join(all_text))
+            content, clipped = budget.clip("\n\n".join(all_text))
+            return ctx.result(content=content, truncated=truncated or clipped)
             
         except (FileNotFoundError, ValueError) as e:
             # Pass through common errors with their messages
-            return DocumentResult.from_path(file_path, error=str(e))
-        except PackageNotFoundError:
-            return DocumentResult.from_path(file_path, error="Invalid or corrupted DOCX file")
+            return ctx.result(error=str(e))
+        except (PackageNotFoundError, zipfile.BadZipFile):
+            return ctx.result(error="Invalid or corrupted DOCX file")
+        except Exception as e:
+            return ctx.result(error=f"Unexpected error during DOCX extraction: {e}")
+        finally:
+            if owns_context:
+                ctx.close()
+
+    @staticmethod
+    def inspect(file_path: Union[str, Path, FileContext]) -> DocumentInfo:
+        """Report structural metadata for a DOCX file without extracting text.
+        
+        The page count comes from the application properties Word stores in
+        the package and is None when the producing application omitted it.
+        
+        Args:
+            file_path: Path to the DOCX file, or a FileContext whose stat is
+                reused
+            
+        Returns:
+            DocumentInfo containing file metadata and whether the file opens
+        """
+        ctx = open_context(file_path)
+        file_path = ctx.path
+        
+        try:
+            stats = ctx.stat
+        except FileNotFoundError:
+            return DocumentInfo.from_error(file_path, f"File not found: {file_path}")
+        except OSError as e:
+            return DocumentInfo.from_error(file_path, str(e))
+        
+        try:
+            with zipfile.ZipFile(file_path) as package:
+                names = set(package.namelist())
+                if _DOCUMENT_PART not in names:
+                    raise KeyError(_DOCUMENT_PART)
+                page_count = None
+                if _APP_PROPERTIES_PART in names:
+                    pages = ElementTree.fromstring(package.read(_APP_PROPERTIES_PART)).find(_PAGES_TAG)
+                    if pages is not None and pages.text and pages.text.strip().isdigit():
+                        page_count = int(pages.text)
+            return DocumentInfo.from_path(file_path, page_count=page_count, stats=stats)
+        except (zipfile.BadZipFile, KeyError, ElementTree.ParseError):
+            return DocumentInfo.from_path(file_path, error="Invalid or corrupted DOCX file", stats=stats)
         except Exception as e:
-            return DocumentResult.from_path(file_path, error=f"Unexpected error during DOCX extraction: {e}")
\ No newline at end of file
+            return DocumentInfo.from_path(file_path, error=f"Unexpected error during DOCX inspection: {e}", stats=stats)
@@ -2,50 +2,112 @@
 PDF text extraction using PyMuPDF (fitz).
 """
 
-import fitz
 from pathlib import Path
-from typing import Union
+from typing import Optional, Union
 
-from ..models import DocumentResult
+try:
+    import pymupdf as fitz
+except ImportError:  # PyMuPDF before 1.24.3 only provides the fitz module
+    import fitz
+
+from ..fileio import FileContext, open_context
+from ..models import DocumentResult, DocumentInfo, ExtractionBudget
 
 class PDFExtractor:
     """Extracts text from PDF files using PyMuPDF (fitz)."""
     
     @staticmethod
-    def extract(file_path: Union[str, Path]) -> DocumentResult:
+    def extract(
+        file_path: Union[str, Path, FileContext],
+        budget: Optional[ExtractionBudget] = None
+    ) -> DocumentResult:
         """
         Extract text from a PDF file.
         
         Args:
-            file_path: Path to the PDF file (string or Path object)
+            file_path: Path to the PDF file (string or Path object), or a
+                FileContext whose already-read bytes are parsed in memory
+            budget: Optional page/character/byte limits; extraction stops
+                early and the result is flagged as truncated when exceeded
             
         Returns:
             DocumentResult: Extraction result containing the text and metadata
         """
-        file_path = Path(file_path)
+        owns_context = not isinstance(file_path, FileContext)
+        ctx = open_context(file_path)
+        file_path = ctx.path
         
         try:
-            if not file_path.exists():
+            try:
+                ctx.stat
+            except FileNotFoundError:
                 raise FileNotFoundError(f"File not found: {file_path}")
                 
-            if file_path.suffix.lower() != '.pdf':
+            if ctx.file_type != 'pdf':
                 raise ValueError(f"Not a PDF file: {file_path}")
             
+            budget = budget or ExtractionBudget()
             text = ""
-            with fitz.open(str(file_path)) as doc:
+            truncated = False
+            with fitz.open(stream=ctx.buffer(), filetype="pdf") as doc:
+                if not doc.is_pdf:
+                    raise ValueError(f"Not a PDF file: {file_path}")
                 # Extract text from each page
-                for page in doc:
+                for page_number, page in enumerate(doc):
+                    if budget.pages_exhausted(page_number) or budget.text_exhausted(len(text)):
+                        truncated = True
+                        break
                     text += page.get_text()
-                    
-            return DocumentResult.from_path(file_path, content=text.strip())
+            
+            text, clipped = budget.clip(text.strip())
+            return ctx.result(content=text, truncated=truncated or clipped)
             
         except (FileNotFoundError, ValueError) as e:
             # Pass through common errors with their messages
-            return DocumentResult.from_path(file_path, error=str(e))
-        except fitz.fitz.FileDataError as e:
-            return DocumentResult.from_path(file_path, error=f"Invalid or corrupted PDF file: {e}")
+            return ctx.result(error=str(e))
+        except fitz.FileDataError as e:
+            return ctx.result(error=f"Invalid or corrupted PDF file: {e}")
+        except Exception as e:
+            return ctx.result(error=f"Unexpected error during PDF extraction: {e}")
+        finally:
+            if owns_context:
+                ctx.close()
+
+    @staticmethod
+    def inspect(file_path: Union[str, Path, FileContext]) -> DocumentInfo:
+        """
+        Report structural metadata for a PDF file without extracting text.
+        
+        Only the document trailer and xref are read to obtain the page count.
+        
+        Args:
+            file_path: Path to the PDF file (string or Path object), or a
+                FileContext whose stat is reused
+            
+        Returns:
+            DocumentInfo: File metadata, page count and whether the file opens
+        """
+        ctx = open_context(file_path)
+        file_path = ctx.path
+        
+        try:
+            stats = ctx.stat
+        except FileNotFoundError:
+            return DocumentInfo.from_error(file_path, f"File not found: {file_path}")
+        except OSError as e:
+            return DocumentInfo.from_error(file_path, str(e))
+        
+        try:
+            # MuPDF picks its handler from the content even when told the
+            # filetype, so Office packages would otherwise open as documents
+            with fitz.open(str(file_path), filetype="pdf") as doc:
+                if not doc.is_pdf:
+                    return DocumentInfo.from_path(file_path, error=f"Not a PDF file: {file_path}", stats=stats)
+                if doc.needs_pass:
+                    return DocumentInfo.from_path(file_path, error="Encrypted PDF file", stats=stats)
+                return DocumentInfo.from_path(file_path, page_count=doc.page_count, stats=stats)
         except Exception as e:
-            return DocumentResult.from_path(file_path, error=f"Unexpected error during PDF extraction: {e}")
+            return DocumentInfo.from_path(file_path, error=f"Invalid or corrupted PDF file: {e}", stats=stats)
 
     @staticmethod
     def extract_text(file_path: Union[str, Path]) -> str:
@@ -2,64 +2,124 @@
 PowerPoint text extraction using python-pptx.
 """
 
+import zipfile
 from pathlib import Path
-from typing import Union
+from typing import Optional, Union
+from xml.etree import ElementTree
 from pptx import Presentation
 from pptx.exc import PackageNotFoundError
 
-from ..models import DocumentResult
+from ..fileio import FileContext, open_context
+from ..models import DocumentResult, DocumentInfo, ExtractionBudget
+
+_PRESENTATION_PART = "ppt/presentation.xml"
+_SLIDE_ID_TAG = "{http://schemas.openxmlformats.org/presentationml/2006/main}sldId"
 
 
 class PPTXExtractor:
     """Extracts text from PowerPoint files using python-pptx."""
     
     @staticmethod
-    def extract(file_path: Union[str, Path]) -> DocumentResult:
+    def extract(
+        file_path: Union[str, Path, FileContext],
+        budget: Optional[ExtractionBudget] = None
+    ) -> DocumentResult:
         """
         Extract text from a PowerPoint file.
         
         Args:
-            file_path: Path to the PowerPoint file (string or Path object)
+            file_path: Path to the PowerPoint file (string or Path object), or
+                a FileContext whose already-read bytes are parsed in memory
+            budget: Optional slide/character/byte limits; extraction stops
+                early and the result is flagged as truncated when exceeded
             
         Returns:
             DocumentResult: Extraction result containing the text and metadata
         """
-        file_path = Path(file_path)
+        owns_context = not isinstance(file_path, FileContext)
+        ctx = open_context(file_path)
+        file_path = ctx.path
         
         try:
-            if not file_path.exists():
+            try:
+                ctx.stat
+            except FileNotFoundError:
                 raise FileNotFoundError(f"File not found: {file_path}")
                 
-            if file_path.suffix.lower() != '.pptx':
+            if ctx.file_type != 'pptx':
                 raise ValueError(f"Not a PPTX file: {file_path}")
             
+            budget = budget or ExtractionBudget()
             text = []
-            prs = Presentation(str(file_path))
+            chars = 0
+            truncated = False
+            prs = Presentation(ctx.stream())
             
             # Extract text from each slide's shapes
-            for slide in prs.slides:
+            for slide_number, slide in enumerate(prs.slides):
+                if budget.pages_exhausted(slide_number) or budget.text_exhausted(chars):
+                    truncated = True
+                    break
                 for shape in slide.shapes:
                     if hasattr(shape, "text") and shape.text.strip():
                         text.append(shape.text.strip())
+                        chars += len(text[-1]) + 1
             
-            return DocumentResult.from_path(
-                file_path,
-                content="\n".join(text)
+            content, clipped = budget.clip("\n".join(text))
+            return ctx.result(
+                content=content,
+                truncated=truncated or clipped
             )
             
         except (FileNotFoundError, ValueError) as e:
             # Pass through common errors with their messages
-            return DocumentResult.from_path(file_path, error=str(e))
-        except PackageNotFoundError:
-            return DocumentResult.from_path(
-                file_path,
+            return ctx.result(error=str(e))
+        except (PackageNotFoundError, zipfile.BadZipFile):
+            return ctx.result(
                 error="Invalid or corrupted PPTX file"
             )
         except Exception as e:
-            return DocumentResult.from_path(
-                file_path,
+            return ctx.result(
                 error=f"Unexpected error during PPTX extraction: {e}"
             )
+        finally:
+            if owns_context:
+                ctx.close()
+
+    @staticmethod
+    def inspect(file_path: Union[str, Path, FileContext]) -> DocumentInfo:
+        """
+        Report structural metadata for a PowerPoint file without extracting text.
+        
+        Only the package's presentation part is parsed to count slides; slide
+        parts and media are never loaded.
+        
+        Args:
+            file_path: Path to the PowerPoint file (string or Path object), or a
+                FileContext whose stat is reused
+            
+        Returns:
+            DocumentInfo: File metadata, slide count and whether the file opens
+        """
+        ctx = open_context(file_path)
+        file_path = ctx.path
+        
+        try:
+            stats = ctx.stat
+        except FileNotFoundError:
+            return DocumentInfo.from_error(file_path, f"File not found: {file_path}")
+        except OSError as e:
+            return DocumentInfo.from_error(file_path, str(e))
+        
+        try:
+            with zipfile.ZipFile(file_path) as package:
+                root = ElementTree.fromstring(package.read(_PRESENTATION_PART))
+            slide_count = sum(1 for _ in root.iter(_SLIDE_ID_TAG))
+            return DocumentInfo.from_path(file_path, page_count=slide_count, stats=stats)
+        except (zipfile.BadZipFile, KeyError, ElementTree.ParseError):
+            return DocumentInfo.from_path(file_path, error="Invalid or corrupted PPTX file", stats=stats)
+        except Exception as e:
+            return DocumentInfo.from_path(file_path, error=f"Unexpected error during PPTX inspection: {e}", stats=stats)
 
     @staticmethod
     def extract_text(file_path: Union[str, Path]) -> str:
@@ -0,0 +1,206 @@
+"""
+Single-read file access shared by hashing, type detection and parsing.
+"""
+
+import hashlib
+import io
+import mmap
+import os
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+from .models import DocumentResult
+
+
+class _BufferReader(io.RawIOBase):
+    """Read-only, seekable file object over a buffer that is not copied."""
+
+    def __init__(self, buffer):
+        self._view = memoryview(buffer)
+        self._pos = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._pos
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR:
+            offset += self._pos
+        elif whence == io.SEEK_END:
+            offset += len(self._view)
+        if offset < 0:
+            raise ValueError(f"Negative seek position {offset}")
+        self._pos = offset
+        return self._pos
+
+    def readinto(self, buffer) -> int:
+        chunk = self._view[self._pos:self._pos + len(buffer)]
+        size = len(chunk)
+        buffer[:size] = chunk
+        self._pos += size
+        return size
+
+    def close(self) -> None:
+        self._view.release()
+        super().close()
+
+
+class FileContext:
+    """Per-file I/O context that stats once and reads the file at most once.
+
+    The stat result and file bytes are loaded lazily and cached, so type
+    detection, hashing and parsing all share a single ``stat`` and a single
+    read (or memory map for large files). I/O performed is tallied in
+    ``counters`` so the savings can be verified.
+    """
+
+    # Files at least this large are memory-mapped instead of read into memory
+    MMAP_THRESHOLD = 32 * 1024 * 1024
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        mmap_threshold: Optional[int] = None,
+        stat: Optional[os.stat_result] = None
+    ):
+        """Initialize the context.
+
+        Args:
+            path: Path to the file
+            mmap_threshold: Size in bytes from which the file is memory-mapped;
+                defaults to ``MMAP_THRESHOLD``
+            stat: Stat result already obtained elsewhere (e.g. from
+                ``os.scandir``), used instead of calling ``stat`` again
+        """
+        self.path = Path(path)
+        self.mmap_threshold = self.MMAP_THRESHOLD if mmap_threshold is None else mmap_threshold
+        # Document type used to pick and validate the extractor; starts as the
+        # suffix and is replaced by the detected type when content is sniffed.
+        self.file_type = self.path.suffix.lstrip('.').lower()
+        self.counters: Dict[str, int] = {"stat_calls": 0, "open_calls": 0, "read_calls": 0, "bytes_read": 0, "mmaps": 0}
+        self._stat: Optional[os.stat_result] = stat
+        self._data = None
+        self._mmap: Optional[mmap.mmap] = None
+        self._sha256: Optional[str] = None
+        self._views: List[object] = []
+
+    def __enter__(self) -> 'FileContext':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    @property
+    def stat(self) -> os.stat_result:
+        """Return the file's stat result, calling ``stat`` only the first time.
+
+        Raises:
+            OSError: If the file cannot be stat'ed
+        """
+        if self._stat is None:
+            self.counters["stat_calls"] += 1
+            self._stat = self.path.stat()
+        return self._stat
+
+    @property
+    def size(self) -> int:
+        """Return the file size in bytes."""
+        return self.stat.st_size
+
+    @property
+    def data(self):
+        """Return the file contents as ``bytes`` or a read-only ``mmap``, reading it once."""
+        if self._data is None:
+            size = self.size
+            self.counters["open_calls"] += 1
+            with open(self.path, "rb", buffering=0) as f:
+                if size and size >= self.mmap_threshold:
+                    self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                    self._data = self._mmap
+                    self.counters["mmaps"] += 1
+                else:
+                    self._data = f.readall()
+                    self.counters["read_calls"] += 1
+            self.counters["bytes_read"] += len(self._data)
+        return self._data
+
+    @property
+    def loaded(self) -> bool:
+        """Return True once the full contents have been read or mapped."""
+        return self._data is not None
+
+    def read_range(self, offset: int, length: int) -> bytes:
+        """Return up to ``length`` bytes from ``offset`` without loading the whole file.
+
+        Slices the loaded contents when available, otherwise performs a
+        single positioned read.
+        """
+        if self._data is not None:
+            return bytes(self._data[offset:offset + length])
+        self.counters["open_calls"] += 1
+        with open(self.path, "rb", buffering=0) as f:
+            f.seek(offset)
+            chunk = f.read(length)
+        self.counters["read_calls"] += 1
+        self.counters["bytes_read"] += len(chunk)
+        return chunk
+
+    def buffer(self) -> memoryview:
+        """Return a zero-copy view of the file contents for stream-based parsers."""
+        view = memoryview(self.data)
+        self._views.append(view)
+        return view
+
+    def stream(self) -> io.RawIOBase:
+        """Return a seekable file object over the contents for zip-based parsers."""
+        if self._mmap is None:
+            return io.BytesIO(self.data)
+        reader = _BufferReader(self.data)
+        self._views.append(reader)
+        return reader
+
+    def sha256(self) -> str:
+        """Return the SHA-256 hex digest of the file contents, reusing the loaded bytes."""
+        if self._sha256 is None:
+            self._sha256 = hashlib.sha256(self.data).hexdigest()
+        return self._sha256
+
+    def result(self, content: str = "", error: Optional[str] = None, truncated: bool = False) -> DocumentResult:
+        """Create a DocumentResult from the cached stat data."""
+        try:
+            stats = self.stat
+        except OSError:
+            return DocumentResult.from_error(self.path, error or f"File not found: {self.path}")
+        return DocumentResult.from_path(
+            self.path, content, error, truncated=truncated, stats=stats, file_type=self.file_type
+        )
+
+    def close(self) -> None:
+        """Release the loaded contents."""
+        for view in self._views:
+            try:
+                if isinstance(view, memoryview):
+                    view.release()
+                else:
+                    view.close()
+            except BufferError:
+                # Still exported by a parser; the mmap is freed once it is collected
+                pass
+        self._views.clear()
+        if self._mmap is not None:
+            try:
+                self._mmap.close()
+            except BufferError:
+                pass
+            self._mmap = None
+        self._data = None
+
+
+def open_context(file_path: Union[str, Path, FileContext]) -> FileContext:
+    """Return ``file_path`` if it is already a FileContext, otherwise a new one."""
+    return file_path if isinstance(file_path, FileContext) else FileContext(file_path)
@@ -1,7 +1,56 @@
+import os
 from dataclasses import dataclass, asdict
 from datetime import datetime
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
+
+
+@dataclass
+class ExtractionBudget:
+    """Per-document limits that stop text extraction early.
+    
+    ``max_pages`` counts PDF pages and PPTX slides; DOCX files have no
+    stored page structure so only the text limits apply to them.
+    ``max_bytes`` is measured on the UTF-8 encoded content.
+    """
+    max_pages: Optional[int] = None
+    max_chars: Optional[int] = None
+    max_bytes: Optional[int] = None
+
+    def __post_init__(self):
+        for name in ("max_pages", "max_chars", "max_bytes"):
+            limit = getattr(self, name)
+            if limit is not None and limit < 1:
+                raise ValueError(f"{name} must be at least 1, got {limit}")
+
+    def pages_exhausted(self, pages_read: int) -> bool:
+        """Return True once ``pages_read`` pages/slides have used up the budget."""
+        return self.max_pages is not None and pages_read >= self.max_pages
+
+    def text_exhausted(self, chars_read: int) -> bool:
+        """Return True once ``chars_read`` characters are certain to exceed a text limit."""
+        # UTF-8 needs at least one byte per character, so the character count
+        # is a lower bound for the byte count.
+        limits = [limit for limit in (self.max_chars, self.max_bytes) if limit is not None]
+        return any(chars_read > limit for limit in limits)
+
+    def clip(self, text: str) -> Tuple[str, bool]:
+        """Trim ``text`` to the character and byte limits.
+        
+        Returns:
+            Tuple of the (possibly shortened) text and whether it was cut
+        """
+        truncated = False
+        if self.max_chars is not None and len(text) > self.max_chars:
+            text = text[:self.max_chars]
+            truncated = True
+        if self.max_bytes is not None and len(text) > self.max_bytes // 4:
+            encoded = text.encode('utf-8')
+            if len(encoded) > self.max_bytes:
+                text = encoded[:self.max_bytes].decode('utf-8', errors='ignore')
+                truncated = True
+        return text, truncated
+
 
 @dataclass
 class DocumentResult:
@@ -9,24 +58,56 @@ class DocumentResult:
     file_path: str
     file_name: str
     file_type: str
-    date_created: datetime
-    date_modified: datetime
+    date_created: Optional[datetime]
+    date_modified: Optional[datetime]
     extraction_time: datetime
     content: str
     error: Optional[str] = None
+    truncated: bool = False
+    file_size: Optional[int] = None
+    duration_seconds: Optional[float] = None
+    file_sha256: Optional[str] = None
 
     @classmethod
-    def from_path(cls, path: Path, content: str = "", error: Optional[str] = None) -> 'DocumentResult':
-        """Create a DocumentResult instance from a file path."""
-        stats = path.stat()
+    def from_path(
+        cls,
+        path: Path,
+        content: str = "",
+        error: Optional[str] = None,
+        truncated: bool = False,
+        stats: Optional[os.stat_result] = None,
+        file_type: Optional[str] = None
+    ) -> 'DocumentResult':
+        """Create a DocumentResult instance from a file path.
+        
+        ``stats`` may be passed to reuse an earlier ``stat`` of the file and
+        ``file_type`` to report a detected type instead of the suffix.
+        """
+        stats = stats or path.stat()
         return cls(
             file_path=str(path.absolute()),
             file_name=path.name,
-            file_type=path.suffix.lstrip('.').lower(),
+            file_type=file_type or path.suffix.lstrip('.').lower(),
             date_created=datetime.fromtimestamp(stats.st_ctime),
             date_modified=datetime.fromtimestamp(stats.st_mtime),
             extraction_time=datetime.now(),
             content=content,
+            error=error,
+            truncated=truncated,
+            file_size=stats.st_size
+        )
+
+    @classmethod
+    def from_error(cls, path: Path, error: str) -> 'DocumentResult':
+        """Create a DocumentResult for a path that could not be stat'ed."""
+        return cls(
+            file_path=str(path.absolute()),
+            file_name=path.name,
+            file_type=path.suffix.lstrip('.').lower(),
+            date_created=None,
+            date_modified=None,
+            extraction_time=datetime.now(),
+            content="",
             error=error
         )
 
@@ -35,5 +116,66 @@ class DocumentResult:
         data = asdict(self)
         # Convert datetime objects to ISO format strings
         for key in ['date_created', 'date_modified', 'extraction_time']:
-            data[key] = data[key].isoformat()
-        return data
\ No newline at end of file
+            if data[key] is not None:
+                data[key] = data[key].isoformat()
+        return data
+
+
+@dataclass
+class DocumentInfo:
+    """Class representing structural metadata gathered without extracting text."""
+    file_path: str
+    file_name: str
+    file_type: str
+    file_size: Optional[int]
+    date_created: Optional[datetime]
+    date_modified: Optional[datetime]
+    page_count: Optional[int] = None
+    opens: bool = False
+    error: Optional[str] = None
+
+    @classmethod
+    def from_path(
+        cls,
+        path: Path,
+        page_count: Optional[int] = None,
+        error: Optional[str] = None,
+        stats: Optional[os.stat_result] = None
+    ) -> 'DocumentInfo':
+        """Create a DocumentInfo instance from a file path.
+        
+        ``stats`` may be passed to reuse an earlier ``stat`` of the file.
+        """
+        stats = stats or path.stat()
+        return cls(
+            file_path=str(path.absolute()),
+            file_name=path.name,
+            file_type=path.suffix.lstrip('.').lower(),
+            file_size=stats.st_size,
+            date_created=datetime.fromtimestamp(stats.st_ctime),
+            date_modified=datetime.fromtimestamp(stats.st_mtime),
+            page_count=page_count,
+            opens=error is None,
+            error=error
+        )
+
+    @classmethod
+    def from_error(cls, path: Path, error: str) -> 'DocumentInfo':
+        """Create a DocumentInfo for a path that could not be stat'ed."""
+        return cls(
+            file_path=str(path.absolute()),
+            file_name=path.name,
+            file_type=path.suffix.lstrip('.').lower(),
+            file_size=None,
+            date_created=None,
+            date_modified=None,
+            error=error
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the document info to a dictionary."""
+        data = asdict(self)
+        for key in ['date_created', 'date_modified']:
+            if data[key] is not None:
+                data[key] = data[key].isoformat()
+        return data
@@ -1,7 +1,10 @@
 from datetime import datetime
 import os
+import time
 from pathlib import Path
-from typing import Iterator, List, Optional, Dict, Any, Set
+from typing import Iterator, Iterable, List, Optional, Dict, Any, Set, Tuple, Union
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, as_completed, wait
+from concurrent.futures.process import BrokenProcessPool
 import json
 from json import JSONEncoder
 from datetime import datetime
@@ -12,7 +15,10 @@ class DateTimeEncoder(JSONEncoder):
             return obj.isoformat()
         return super().default(obj)
 
-from .models import DocumentResult
+from .models import DocumentResult, DocumentInfo, ExtractionBudget
+from .admission import AdmissionController, measure_usage
+from .fileio import FileContext
+from .sniff import UNREADABLE, TypeSniffer
 from .extractors.pdf import PDFExtractor
 from .extractors.pptx import PPTXExtractor
 from .extractors.docx import DOCXExtractor
@@ -21,14 +27,122 @@ from .extractors.docx import DOCXExtractor
 class DocumentProcessor:
     """Core processing engine for document text extraction."""
     
-    def __init__(self):
-        """Initialize the document processor."""
+    def __init__(
+        self,
+        max_file_size: Optional[int] = None,
+        budget: Optional[ExtractionBudget] = None,
+        admission: Optional[AdmissionController] = None,
+        hash_files: bool = False,
+        detect_types: bool = False
+    ):
+        """Initialize the document processor.
+        
+        Args:
+            max_file_size: Optional size limit in bytes; larger files are
+                reported with an error instead of being extracted
+            budget: Optional per-document page/character/byte limits applied
+                during extraction
+            admission: Optional memory admission controller consulted before
+                each document is handed to a worker process
+            hash_files: Record the SHA-256 of each file, computed from the
+                bytes already read for parsing
+            detect_types: Identify documents by content instead of suffix, so
+                renamed and extensionless files are dispatched to the right
+                extractor and non-documents are rejected before parsing
+        """
+        self.max_file_size = max_file_size
+        self.budget = budget
+        self.admission = admission
+        self.hash_files = hash_files
+        # Totals of FileContext counters (stat calls, reads, bytes read)
+        self.io_counters: Dict[str, int] = {}
+        self.last_io_counters: Optional[Dict[str, int]] = None
+        self.sniffer = TypeSniffer() if detect_types else None
+        self.pool_restarts = 0
         self.extractors = {
             "pdf": PDFExtractor(),
             "pptx": PPTXExtractor(),
             "docx": DOCXExtractor()
         }
     
+    def _worker_options(self) -> Dict[str, Any]:
+        """Return the constructor arguments used to rebuild this processor in a worker process."""
+        return {
+            "max_file_size": self.max_file_size,
+            "budget": self.budget,
+            "hash_files": self.hash_files,
+            "detect_types": self.sniffer is not None
+        }
+    
+    def _add_io(self, counters: Optional[Dict[str, int]]) -> None:
+        """Add one document's I/O counters to the running totals."""
+        for key, value in (counters or {}).items():
+            self.io_counters[key] = self.io_counters.get(key, 0) + value
+    
+    def _stat(self, target: Union[Path, os.DirEntry]) -> Optional[os.stat_result]:
+        """Stat a path or directory entry outside a FileContext, counting the call.
+        
+        Returns:
+            The stat result, or None if the file cannot be stat'ed
+        """
+        self._add_io({"stat_calls": 1})
+        try:
+            return target.stat()
+        except OSError:
+            return None
+    
+    def _select(
+        self,
+        path: Path,
+        entry: Optional[os.DirEntry] = None,
+        stats: Optional[os.stat_result] = None
+    ) -> Tuple[Optional[str], Optional[os.stat_result]]:
+        """Return the type used to select ``path`` and any stat taken to determine it.
+        
+        The type is the suffix, or the sniffed content type with type
+        detection; then None means the file is not a supported document and
+        ``UNREADABLE`` that it could not be stat'ed or read. The stat result
+        is passed on so later stages do not stat the file again.
+        
+        Args:
+            path: Path to the file
+            entry: Directory entry for the file, whose stat is reused for the
+                cache lookup
+            stats: Stat result already obtained for the file
+        """
+        if self.sniffer is None:
+            return path.suffix.lstrip('.').lower(), stats
+        if entry is not None:
+            stats = self._stat(entry)
+            if stats is None:
+                return UNREADABLE, None
+        with FileContext(path, stat=stats) as ctx:
+            file_type = self.sniffer.detect(ctx)
+            self._add_io(ctx.counters)
+            if file_type == UNREADABLE:
+                return file_type, None
+            return file_type, ctx.stat
+    
+    def _document_type(self, path: Path) -> Optional[str]:
+        """Return the type used to select ``path`` (see ``_select``)."""
+        return self._select(path)[0]
+    
+    def _select_listed(
+        self,
+        paths: Iterable[Path],
+        supported_types: set
+    ) -> Iterator[Tuple[Path, Optional[os.stat_result]]]:
+        """Yield each explicitly listed path that should be processed, with its stat if taken.
+        
+        Paths whose type is known and not selected are skipped, including
+        directories and files sniffed as non-documents. Paths that cannot be
+        stat'ed or read are kept so they are reported as errors.
+        """
+        for path in paths:
+            file_type, stats = self._select(path)
+            if file_type in supported_types or file_type == UNREADABLE:
+                yield path, stats
+    
     def _find_documents(
         self,
         input_path: Path,
@@ -43,52 +157,334 @@ class DocumentProcessor:
             file_types: List of file types to process (without dots)
             
         Yields:
-            Path objects for each document found
+            Path objects for each document found. With type detection enabled
+            every file is sniffed, regardless of its suffix
+        """
+        for path, _ in self._discover(input_path, recursive, file_types):
+            yield path
+    
+    def _discover(
+        self,
+        input_path: Path,
+        recursive: bool = True,
+        file_types: Optional[List[str]] = None
+    ) -> Iterator[Tuple[Path, Optional[os.stat_result]]]:
+        """Find documents like ``_find_documents``, yielding each with the stat taken to select it.
+        
+        The stat is None where selection did not need one (suffix matching
+        of directory entries).
         """
         supported_types = set(file_types) if file_types else {"pdf", "pptx", "docx"}
         
-        if input_path.is_file():
-            if input_path.suffix.lstrip('.').lower() in supported_types:
-                yield input_path
+        # Listing the input tells a directory from a file without a stat
+        try:
+            scan = os.scandir(str(input_path))
+        except NotADirectoryError:
+            file_type, stats = self._select(input_path)
+            if file_type in supported_types:
+                yield input_path, stats
             return
-
-        for entry in os.scandir(str(input_path)):
-            entry_path = Path(entry.path)
-            if entry.is_file():
-                if entry_path.suffix.lstrip('.').lower() in supported_types:
-                    yield entry_path
-            elif entry.is_dir() and recursive:
-                yield from self._find_documents(entry_path, recursive, file_types)
-    
-    def _process_single_document(self, path: Path) -> DocumentResult:
+        
+        yield from self._scan_directory(scan, recursive, supported_types)
+    
+    def _scan_directory(
+        self,
+        scan: Iterator[os.DirEntry],
+        recursive: bool,
+        supported_types: Set[str]
+    ) -> Iterator[Tuple[Path, Optional[os.stat_result]]]:
+        """Yield the selected documents of a directory listing with their stat results."""
+        with scan:
+            for entry in scan:
+                entry_path = Path(entry.path)
+                if entry.is_file():
+                    file_type, stats = self._select(entry_path, entry)
+                    if file_type in supported_types:
+                        yield entry_path, stats
+                elif entry.is_dir() and recursive:
+                    yield from self._scan_directory(os.scandir(entry.path), recursive, supported_types)
+    
+    def _process_single_document(self, path: Path, stats: Optional[os.stat_result] = None) -> DocumentResult:
         """Process a single document.
         
         Args:
             path: Path to the document
+            stats: Stat result taken when the document was selected
             
         Returns:
             DocumentResult containing extraction results
         """
-        file_type = path.suffix.lstrip('.').lower()
-        extractor = self.extractors.get(file_type)
+        # One context per file: the stat and the bytes read here are reused
+        # by type detection, the extractor, the hash and the result metadata.
+        with FileContext(path, stat=stats) as ctx:
+            result = self._extract_context(ctx)
+            self.last_io_counters = dict(ctx.counters)
+        self._add_io(self.last_io_counters)
+        return result
+    
+    def _extract_context(self, ctx: FileContext) -> DocumentResult:
+        """Extract text from an open FileContext and return its result."""
+        path = ctx.path
+        try:
+            size = ctx.size
+        except FileNotFoundError:
+            return DocumentResult.from_error(path, f"File not found: {path}")
+        except OSError as e:
+            return DocumentResult.from_error(path, str(e))
+        
+        if self.max_file_size is not None and size > self.max_file_size:
+            return ctx.result(error=f"File exceeds size limit ({size} > {self.max_file_size} bytes)")
         
+        start = time.perf_counter()
         try:
+            if self.sniffer is not None:
+                detected = self.sniffer.detect(ctx, read_all=True)
+                if detected == UNREADABLE:
+                    raise ValueError(f"Cannot read file: {path}")
+                if detected is None:
+                    raise ValueError(f"Not a supported document (content is not PDF, PPTX or DOCX): {path}")
+                ctx.file_type = detected
+            
+            file_type = ctx.file_type
+            extractor = self.extractors.get(file_type)
             if not extractor:
                 raise ValueError(f"No extractor available for file type: {file_type}")
             
-            result = extractor.extract(path)
-            if result.error:
-                return result
-            return DocumentResult.from_path(path, result.content)
+            result = extractor.extract(ctx, budget=self.budget)
+            if not isinstance(result, DocumentResult):
+                raise TypeError(f"Extractor returned {type(result).__name__}, expected DocumentResult")
         except Exception as e:
-            return DocumentResult.from_path(path, "", str(e))
+            result = ctx.result(error=str(e))
+        result.duration_seconds = round(time.perf_counter() - start, 6)
+        
+        if self.hash_files:
+            try:
+                result.file_sha256 = ctx.sha256()
+            except OSError:
+                pass
+        return result
+    
+    def _inspect_single_document(self, path: Path, stats: Optional[os.stat_result] = None) -> DocumentInfo:
+        """Gather structural metadata for a single document without extracting text.
+        
+        Args:
+            path: Path to the document
+            stats: Stat result taken when the document was selected
+            
+        Returns:
+            DocumentInfo describing the document
+        """
+        with FileContext(path, stat=stats) as ctx:
+            info = self._inspect_context(ctx)
+            self.last_io_counters = dict(ctx.counters)
+        self._add_io(self.last_io_counters)
+        return info
+    
+    def _inspect_context(self, ctx: FileContext) -> DocumentInfo:
+        """Inspect the document of an open FileContext and return its metadata."""
+        path = ctx.path
+        try:
+            stats = ctx.stat
+        except FileNotFoundError:
+            return DocumentInfo.from_error(path, f"File not found: {path}")
+        except OSError as e:
+            return DocumentInfo.from_error(path, str(e))
+        
+        if self.sniffer is not None:
+            detected = self.sniffer.detect(ctx)
+            if detected == UNREADABLE:
+                return DocumentInfo.from_error(path, f"Cannot read file: {path}")
+            if detected is None:
+                return DocumentInfo.from_path(
+                    path, error="Not a supported document (content is not PDF, PPTX or DOCX)", stats=stats
+                )
+            ctx.file_type = detected
+        extractor = self.extractors.get(ctx.file_type)
+        if not extractor:
+            return DocumentInfo.from_path(path, error=f"No extractor available for file type: {ctx.file_type}", stats=stats)
+        info = extractor.inspect(ctx)
+        info.file_type = ctx.file_type
+        return info
+    
+    def _map_paths(
+        self,
+        paths: Iterable[Union[str, Path]],
+        file_types: Optional[List[str]],
+        max_workers: int,
+        method: str,
+        discovered: bool = False
+    ) -> Iterator[Dict[str, Any]]:
+        """Apply a per-document method to each selected path, optionally in worker processes.
+        
+        ``discovered`` marks ``(path, stat)`` pairs from ``_discover``, which
+        are already filtered. Listed paths are only skipped when their type is
+        known and not selected (see ``_select_listed``). A stat taken while
+        selecting a document is reused by the admission estimate and the
+        worker, so each file is stat'ed once.
+        """
+        supported_types = set(file_types) if file_types else {"pdf", "pptx", "docx"}
+        if discovered:
+            selected = paths
+        else:
+            selected = self._select_listed(map(Path, paths), supported_types)
+        
+        if max_workers <= 1:
+            handler = getattr(self, method)
+            for doc_path, stats in selected:
+                yield handler(doc_path, stats).to_dict()
+            return
+        
+        admission = self.admission
+        if admission:
+            admission.reset_workers()
+        
+        executor = self._start_pool(max_workers)
+        try:
+            # Keep a bounded number of files in flight so that long path
+            # streams are neither read ahead nor held in memory.
+            pending: Dict[Any, Path] = {}
+            broken = False
+            for doc_path, stats in selected:
+                if admission:
+                    detected, stats = self._select(doc_path, stats=stats)
+                    if stats is None and detected != UNREADABLE:
+                        stats = self._stat(doc_path)
+                    if detected not in self.extractors:
+                        detected = None
+                    file_type, size, estimate = admission.estimate_path(doc_path, detected, stats)
+                while pending and (
+                    broken
+                    or len(pending) >= max_workers * 2
+                    or (admission and not admission.can_admit(estimate))
+                ):
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        broken = broken or isinstance(future.exception(), BrokenProcessPool)
+                        yield self._collect(future, pending.pop(future), method)
+                
+                while True:
+                    if broken:
+                        # A worker died (e.g. killed for running out of memory)
+                        # and took the pool down; every document that was in
+                        # flight has been reported, so continue with a new pool.
+                        executor.shutdown(wait=False)
+                        executor = self._start_pool(max_workers)
+                        self.pool_restarts += 1
+                        if admission:
+                            admission.reset_workers()
+                        broken = False
+                    try:
+                        future = executor.submit(_run_in_worker, method, doc_path, stats)
+                        break
+                    except BrokenProcessPool:
+                        broken = True
+                if admission:
+                    admission.admit(future, file_type, size, estimate)
+                pending[future] = doc_path
+            
+            for future in as_completed(pending):
+                yield self._collect(future, pending[future], method)
+        finally:
+            executor.shutdown()
+    
+    def _start_pool(self, max_workers: int) -> ProcessPoolExecutor:
+        """Create a worker pool whose processes each hold a copy of this processor's options."""
+        return ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=_init_worker,
+            initargs=(self._worker_options(),)
+        )
+    
+    def _collect(self, future, path: Path, method: str) -> Dict[str, Any]:
+        """Return a finished worker's record and account for its memory and I/O use.
+        
+        Documents lost because their worker process died are returned as
+        error records.
+        """
+        try:
+            record, usage = future.result()
+        except BrokenProcessPool:
+            if self.admission:
+                self.admission.release(future)
+            result_type = DocumentInfo if method == "_inspect_single_document" else DocumentResult
+            error = "Worker process terminated unexpectedly while this document was in flight"
+            return result_type.from_error(path, error).to_dict()
+        self._add_io(usage.get("io"))
+        if self.admission:
+            self.admission.release(future, usage)
+        return record
+    
+    def process_paths(
+        self,
+        paths: Iterable[Union[str, Path]],
+        file_types: Optional[List[str]] = None,
+        max_workers: int = 1
+    ) -> Iterator[Dict[str, Any]]:
+        """Process an explicit list of document paths without directory discovery.
+        
+        Args:
+            paths: Iterable of file paths; consumed lazily so it may be a stream
+            file_types: List of file types to process (without dots); paths
+                with other suffixes are skipped
+            max_workers: Number of worker processes. With more than one worker
+                results are yielded in completion order rather than input order
+            
+        Yields:
+            Dictionary containing extraction results for each document
+        """
+        return self._map_paths(paths, file_types, max_workers, "_process_single_document")
+    
+    def triage_paths(
+        self,
+        paths: Iterable[Union[str, Path]],
+        file_types: Optional[List[str]] = None,
+        max_workers: int = 1
+    ) -> Iterator[Dict[str, Any]]:
+        """Report type, size, page/slide count and openability without extracting text.
+        
+        Args:
+            paths: Iterable of file paths; consumed lazily so it may be a stream
+            file_types: List of file types to inspect (without dots)
+            max_workers: Number of worker processes
+            
+        Yields:
+            Dictionary containing structural metadata for each document
+        """
+        return self._map_paths(paths, file_types, max_workers, "_inspect_single_document")
+    
+    def triage_documents(
+        self,
+        input_path: str,
+        recursive: bool = False,
+        file_types: Optional[List[str]] = None,
+        max_workers: int = 1
+    ) -> Iterator[Dict[str, Any]]:
+        """Inspect documents found under ``input_path`` without extracting text.
+        
+        Args:
+            input_path: Path to file or directory to inspect
+            recursive: Whether to recursively search directories
+            file_types: List of file types to inspect
+            max_workers: Number of worker processes
+            
+        Yields:
+            Dictionary containing structural metadata for each document
+        """
+        return self._map_paths(
+            self._discover(Path(input_path), recursive, file_types),
+            file_types,
+            max_workers,
+            "_inspect_single_document",
+            discovered=True
+        )
     
     def process_documents(
         self,
         input_path: str,
         output_path: Optional[str] = None,
         recursive: bool = False,
-        file_types: Optional[List[str]] = None
+        file_types: Optional[List[str]] = None,
+        max_workers: int = 1
     ) -> Iterator[Dict[str, Any]]:
         """Process documents and handle output.
         
@@ -97,6 +493,7 @@ class DocumentProcessor:
             output_path: Optional path to write JSON output
             recursive: Whether to recursively search directories
             file_types: List of file types to process
+            max_workers: Number of worker processes used for extraction
             
         Yields:
             Dictionary containing extraction results for each document
@@ -104,9 +501,13 @@ class DocumentProcessor:
         path = Path(input_path)
         documents = []
         
-        for doc_path in self._find_documents(path, recursive, file_types):
-            result = self._process_single_document(doc_path)
-            doc_dict = result.to_dict()
+        for doc_dict in self._map_paths(
+            self._discover(path, recursive, file_types),
+            file_types,
+            max_workers,
+            "_process_single_document",
+            discovered=True
+        ):
             documents.append(doc_dict)
             yield doc_dict
         
@@ -114,4 +515,28 @@ class DocumentProcessor:
             output_path = Path(output_path)
             output_path.parent.mkdir(parents=True, exist_ok=True)
             with open(output_path, 'w', encoding='utf-8') as f:
-                json.dump({"documents": documents}, f, indent=2, cls=DateTimeEncoder)
\ No newline at end of file
+                json.dump({"documents": documents}, f, indent=2, cls=DateTimeEncoder)
+
+
+_worker_processor: Optional[DocumentProcessor] = None
+
+
+def _init_worker(options: Dict[str, Any]) -> None:
+    """Create the per-process DocumentProcessor used by worker processes."""
+    global _worker_processor
+    _worker_processor = DocumentProcessor(**options)
+
+
+def _run_in_worker(
+    method: str,
+    path: Path,
+    stats: Optional[os.stat_result] = None
+) -> Tuple[Dict[str, Any], Dict[str, Optional[int]]]:
+    """Run a per-document DocumentProcessor method inside a worker process.
+    
+    Returns:
+        Tuple of the result dictionary and the worker's memory and I/O usage report
+    """
+    result, usage = measure_usage(getattr(_worker_processor, method), path, stats)
+    usage["io"] = _worker_processor.last_io_counters
+    return result.to_dict(), usage
@@ -0,0 +1,159 @@
+"""
+Content-based document type detection.
+
+Identifies PDF, DOCX and PPTX files from their leading bytes and, for OOXML
+packages, the part names in the ZIP directory, without opening them with a
+parsing library. Results are cached by stat signature so files that have not
+changed since the last scan are not read again.
+"""
+
+import json
+import os
+import stat
+import struct
+from pathlib import Path
+from typing import Dict, Optional, Tuple, Union
+
+from .fileio import FileContext
+
+HEAD_SIZE = 4096
+# The end-of-central-directory record is 22 bytes plus a comment of up to 64 KiB
+TAIL_SIZE = 22 + 65535
+
+_PDF_MAGIC = b"%PDF-"
+# Readers accept a PDF header that does not start at offset zero
+_PDF_HEADER_WINDOW = 1024
+_ZIP_MAGIC = b"PK\x03\x04"
+_EOCD_MAGIC = b"PK\x05\x06"
+_OOXML_PARTS = (
+    (b"word/document.xml", "docx"),
+    (b"ppt/presentation.xml", "pptx"),
+)
+
+# Returned by ``TypeSniffer.detect`` when a file cannot be stat'ed or read, as
+# opposed to None for a file that was read and is not a supported document
+UNREADABLE = "unreadable"
+
+_Signature = Tuple[int, int, int, int]
+
+
+def _ooxml_type(data: bytes) -> Optional[str]:
+    for part_name, file_type in _OOXML_PARTS:
+        if part_name in data:
+            return file_type
+    return None
+
+
+def detect_type(ctx: FileContext) -> Optional[str]:
+    """Detect the document type of a file from its content.
+
+    Reads the first ``HEAD_SIZE`` bytes and, for ZIP files whose main part
+    is not named there, the central directory at the end of the file. Uses
+    the already-loaded contents of ``ctx`` when available.
+
+    Args:
+        ctx: FileContext for the file
+
+    Returns:
+        "pdf", "docx", "pptx", or None if the file is not a supported document
+
+    Raises:
+        OSError: If the file cannot be read
+    """
+    size = ctx.size
+    head = ctx.read_range(0, HEAD_SIZE)
+    if _PDF_MAGIC in head[:_PDF_HEADER_WINDOW]:
+        return "pdf"
+    if not head.startswith(_ZIP_MAGIC):
+        return None
+
+    # Local headers near the start often already name the main part
+    file_type = _ooxml_type(head)
+    if file_type or size <= HEAD_SIZE:
+        return file_type
+
+    tail_start = max(size - TAIL_SIZE, 0)
+    tail = ctx.read_range(tail_start, size - tail_start)
+    eocd = tail.rfind(_EOCD_MAGIC)
+    if eocd < 0 or len(tail) < eocd + 20:
+        return None
+    directory_size, directory_offset = struct.unpack("<II", tail[eocd + 12:eocd + 20])
+    if directory_offset == 0xFFFFFFFF or directory_offset + directory_size > size:
+        # ZIP64 or inconsistent offsets; fall back to whatever the tail holds
+        return _ooxml_type(tail)
+    if directory_offset >= tail_start:
+        start = directory_offset - tail_start
+        return _ooxml_type(tail[start:start + directory_size])
+    return _ooxml_type(ctx.read_range(directory_offset, directory_size))
+
+
+class TypeSniffer:
+    """Detects document types by content and caches results by stat signature.
+
+    A cached result is reused while the file's device, inode, size and
+    modification time are unchanged, so repeated scans of an unchanged tree
+    only cost the ``stat`` calls discovery performs anyway.
+    """
+
+    def __init__(self):
+        """Initialize the sniffer with an empty cache."""
+        self._cache: Dict[str, Tuple[_Signature, Optional[str]]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _signature(stats: os.stat_result) -> _Signature:
+        return (stats.st_dev, stats.st_ino, stats.st_size, stats.st_mtime_ns)
+
+    def detect(self, ctx: FileContext, read_all: bool = False) -> Optional[str]:
+        """Return the document type of ``ctx``, from the cache when the file is unchanged.
+
+        Args:
+            ctx: FileContext for the file
+            read_all: Load the whole file first on a cache miss, for callers
+                that are about to parse it anyway
+
+        Returns:
+            "pdf", "docx", "pptx", None for directories and other files that
+            are not supported documents, or ``UNREADABLE`` if the file cannot
+            be stat'ed or read
+        """
+        try:
+            stats = ctx.stat
+        except OSError:
+            return UNREADABLE
+        if not stat.S_ISREG(stats.st_mode):
+            return None
+        signature = self._signature(stats)
+        key = str(ctx.path.absolute())
+        cached = self._cache.get(key)
+        if cached is not None and cached[0] == signature:
+            self.hits += 1
+            return cached[1]
+
+        self.misses += 1
+        try:
+            if read_all:
+                ctx.data  # Load once so sniffing slices the same buffer the parser uses
+            file_type = detect_type(ctx)
+        except OSError:
+            # Not cached: the file may become readable later
+            return UNREADABLE
+        self._cache[key] = (signature, file_type)
+        return file_type
+
+    def load(self, path: Union[str, Path]) -> None:
+        """Merge cached results saved by ``save``; a missing file is ignored."""
+        try:
+            data = json.loads(Path(path).read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return
+        for key, (signature, file_type) in data.items():
+            self._cache[key] = (tuple(signature), file_type)
+
+    def save(self, path: Union[str, Path]) -> None:
+        """Write the cache to ``path`` as JSON."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data = {key: [list(signature), file_type] for key, (signature, file_type) in self._cache.items()}
+        path.write_text(json.dumps(data), encoding="utf-8")
@@ -0,0 +1,318 @@
+"""
+Versioned output store with delta encoding between extraction runs.
+
+Each committed run becomes a numbered version that records only what changed
+since the previous version:
+
+- new or changed content is written once as a content-addressed object,
+  either in full or as a line delta against the previous content of the
+  same document when that is smaller;
+- unchanged documents are not written at all, and metadata-only changes
+  reference the existing content object;
+- documents missing from a full run are recorded as tombstones.
+
+Every ``snapshot_interval`` versions the complete metadata manifest (without
+content) is written as well, so reconstructing any version replays at most
+that many change sets.
+
+Commits take an exclusive lock on ``<root>/lock`` so concurrent runs against
+the same store are serialized instead of racing for the next version number.
+The lock uses ``fcntl`` and is not taken where that is unavailable (Windows),
+so there only one process may commit to a store at a time.
+"""
+
+import difflib
+import hashlib
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Union
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+# Fields that make a document count as changed; extraction_time and
+# duration_seconds differ on every run and are only stored when something
+# else changed.
+_COMPARED_FIELDS = ("content_sha256", "error", "date_modified", "file_size", "truncated", "file_type")
+
+
+class OutputStore:
+    """Stores extraction runs as versions whose size grows with churn, not corpus size."""
+
+    def __init__(
+        self,
+        root: Union[str, Path],
+        snapshot_interval: int = 20,
+        max_delta_chain: int = 8
+    ):
+        """Initialize the store.
+
+        Args:
+            root: Directory holding the store; created if missing
+            snapshot_interval: Write a full metadata manifest every N versions
+            max_delta_chain: Store content in full once a delta would have to
+                be applied on top of this many earlier deltas
+        """
+        self.root = Path(root)
+        self.snapshot_interval = snapshot_interval
+        self.max_delta_chain = max_delta_chain
+        self.last_commit_stats: Dict[str, int] = {}
+        (self.root / "versions").mkdir(parents=True, exist_ok=True)
+        (self.root / "objects").mkdir(parents=True, exist_ok=True)
+        self._state_cache: Optional[tuple] = None
+
+    # Versions
+
+    def versions(self) -> List[int]:
+        """Return all committed version numbers in ascending order."""
+        return sorted(int(p.stem) for p in (self.root / "versions").glob("*.json"))
+
+    def latest(self) -> Optional[int]:
+        """Return the newest version number, or None for an empty store."""
+        versions = self.versions()
+        return versions[-1] if versions else None
+
+    def _version_path(self, version: int) -> Path:
+        return self.root / "versions" / f"{version:06d}.json"
+
+    def _read_version(self, version: int) -> Dict[str, Any]:
+        path = self._version_path(version)
+        if not path.exists():
+            raise ValueError(f"No such version: {version}")
+        return json.loads(path.read_text(encoding="utf-8"))
+
+    def _manifest(self, version: Optional[int]) -> Dict[str, Dict[str, Any]]:
+        """Return document metadata (without content) for ``version``, keyed by file path."""
+        if version is None:
+            return {}
+        if self._state_cache and self._state_cache[0] == version:
+            return dict(self._state_cache[1])
+
+        # Walk back to the nearest snapshot, then replay the change sets
+        pending = []
+        number = version
+        while True:
+            data = self._read_version(number)
+            if data.get("snapshot") is not None:
+                state = dict(data["snapshot"])
+                break
+            pending.append(data["changes"])
+            if number == 1:
+                state = {}
+                break
+            number -= 1
+        for changes in reversed(pending):
+            self._apply(state, changes)
+
+        self._state_cache = (version, state)
+        return dict(state)
+
+    @staticmethod
+    def _apply(state: Dict[str, Dict[str, Any]], changes: Dict[str, Optional[Dict[str, Any]]]) -> None:
+        for path, entry in changes.items():
+            if entry is None:
+                state.pop(path, None)
+            else:
+                state[path] = entry
+
+    # Content objects
+
+    def _object_path(self, digest: str, suffix: str) -> Path:
+        return self.root / "objects" / digest[:2] / f"{digest}{suffix}"
+
+    def _write_atomic(self, path: Path, data: bytes) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = path.with_name(path.name + ".tmp")
+        temp_path.write_bytes(data)
+        os.replace(temp_path, path)
+
+    def _has_object(self, digest: str) -> bool:
+        return self._object_path(digest, ".txt").exists() or self._object_path(digest, ".delta").exists()
+
+    def _delta_depth(self, digest: str) -> int:
+        path = self._object_path(digest, ".delta")
+        if not path.exists():
+            return 0
+        return json.loads(path.read_text(encoding="utf-8"))["depth"]
+
+    def read_content(self, digest: str) -> str:
+        """Return the text stored under a content digest, resolving deltas."""
+        full_path = self._object_path(digest, ".txt")
+        if full_path.exists():
+            # Decode bytes directly so newline translation cannot alter content
+            return full_path.read_bytes().decode("utf-8")
+        delta = json.loads(self._object_path(digest, ".delta").read_text(encoding="utf-8"))
+        base_lines = self.read_content(delta["base"]).splitlines(keepends=True)
+        parts = []
+        for op in delta["ops"]:
+            if op[0] == "=":
+                parts.extend(base_lines[op[1]:op[2]])
+            else:
+                parts.append(op[1])
+        return "".join(parts)
+
+    def _store_content(self, content: str, digest: str, base_digest: Optional[str]) -> int:
+        """Write ``content`` unless already stored; return the number of bytes written."""
+        if self._has_object(digest):
+            return 0
+        base_depth = self._delta_depth(base_digest) if base_digest else None
+        if base_depth is not None and base_depth < self.max_delta_chain:
+            base_lines = self.read_content(base_digest).splitlines(keepends=True)
+            lines = content.splitlines(keepends=True)
+            ops: List[list] = []
+            matcher = difflib.SequenceMatcher(None, base_lines, lines, autojunk=False)
+            for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+                if tag == "equal":
+                    ops.append(["=", i1, i2])
+                elif j2 > j1:
+                    ops.append(["+", "".join(lines[j1:j2])])
+            encoded = json.dumps({
+                "base": base_digest,
+                "depth": base_depth + 1,
+                "ops": ops
+            }).encode("utf-8")
+            if len(encoded) < len(content.encode("utf-8")) // 2:
+                self._write_atomic(self._object_path(digest, ".delta"), encoded)
+                return len(encoded)
+        encoded = content.encode("utf-8")
+        self._write_atomic(self._object_path(digest, ".txt"), encoded)
+        return len(encoded)
+
+    # Writing
+
+    def commit(
+        self,
+        records: Iterable[Dict[str, Any]],
+        partial: bool = False,
+        scope: Optional[Callable[[Dict[str, Any]], bool]] = None
+    ) -> int:
+        """Record an extraction run as a new version.
+
+        Args:
+            records: Result dictionaries as yielded by ``process_documents``;
+                consumed lazily, so a streaming run can be committed as it goes
+            partial: The run covered only some documents (e.g. a list of
+                changed files); documents missing from it are kept instead of
+                being tombstoned
+            scope: Predicate over a previously stored document's metadata
+                that is True if the run covered it (e.g. same directory, type
+                filter and recursion). Only documents in scope that are
+                missing from the run are tombstoned; by default all are
+
+        Returns:
+            int: The new version number
+        """
+        lock_file = open(self.root / "lock", "a")
+        try:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            return self._commit(records, partial, scope)
+        finally:
+            # Closing the file releases the lock
+            lock_file.close()
+
+    def _commit(
+        self,
+        records: Iterable[Dict[str, Any]],
+        partial: bool,
+        scope: Optional[Callable[[Dict[str, Any]], bool]]
+    ) -> int:
+        parent = self.latest()
+        previous = self._manifest(parent)
+        changes: Dict[str, Optional[Dict[str, Any]]] = {}
+        seen = set()
+        stats = {"documents": 0, "added": 0, "modified": 0, "unchanged": 0, "deleted": 0, "bytes_written": 0}
+
+        for record in records:
+            entry = {key: value for key, value in record.items() if key != "content"}
+            content = record.get("content") or ""
+            digest = hashlib.sha256(content.encode("utf-8")).hexdigest()
+            entry["content_sha256"] = digest
+            path = entry["file_path"]
+            seen.add(path)
+            stats["documents"] += 1
+
+            old = previous.get(path)
+            if old is not None and all(old.get(key) == entry.get(key) for key in _COMPARED_FIELDS):
+                stats["unchanged"] += 1
+                continue
+            stats["added" if old is None else "modified"] += 1
+            stats["bytes_written"] += self._store_content(content, digest, old and old["content_sha256"])
+            changes[path] = entry
+
+        if not partial:
+            for path in previous.keys() - seen:
+                if scope is not None and not scope(previous[path]):
+                    continue
+                changes[path] = None
+                stats["deleted"] += 1
+
+        version = (parent or 0) + 1
+        state = previous
+        self._apply(state, changes)
+        data = {
+            "version": version,
+            "parent": parent,
+            "created": datetime.now().isoformat(),
+            "changes": changes,
+        }
+        if version % self.snapshot_interval == 0:
+            data["snapshot"] = state
+        encoded = json.dumps(data).encode("utf-8")
+        self._write_atomic(self._version_path(version), encoded)
+        stats["bytes_written"] += len(encoded)
+
+        self._state_cache = (version, state)
+        self.last_commit_stats = stats
+        return version
+
+    # Reading
+
+    def documents(self, version: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """Reconstruct the records of a version (the latest by default).
+
+        Yields:
+            Result dictionaries with ``content`` restored, in file path order
+        """
+        version = self.latest() if version is None else version
+        for path, entry in sorted(self._manifest(version).items()):
+            record = dict(entry)
+            record["content"] = self.read_content(record.pop("content_sha256"))
+            yield record
+
+    def load(self, version: Optional[int] = None) -> Dict[str, Any]:
+        """Return a version in the ``{"documents": [...]}`` format written by ``process_documents``."""
+        return {"documents": list(self.documents(version))}
+
+    def diff(self, old_version: int, new_version: int) -> Dict[str, List[str]]:
+        """Compare two versions.
+
+        Returns:
+            Dictionary of file paths that were ``added``, ``removed``,
+            ``modified`` (content or metadata) between the versions
+        """
+        old, new = self._manifest(old_version), self._manifest(new_version)
+        return {
+            "added": sorted(new.keys() - old.keys()),
+            "removed": sorted(old.keys() - new.keys()),
+            "modified": sorted(
+                path for path in old.keys() & new.keys()
+                if any(old[path].get(key) != new[path].get(key) for key in _COMPARED_FIELDS)
+            ),
+        }
+
+    def diff_content(self, file_path: str, old_version: int, new_version: int) -> str:
+        """Return a unified diff of one document's content between two versions."""
+        old, new = self._manifest(old_version).get(file_path), self._manifest(new_version).get(file_path)
+        old_text = self.read_content(old["content_sha256"]) if old else ""
+        new_text = self.read_content(new["content_sha256"]) if new else ""
+        return "".join(difflib.unified_diff(
+            old_text.splitlines(keepends=True),
+            new_text.splitlines(keepends=True),
+            fromfile=f"{file_path}@{old_version}",
+            tofile=f"{file_path}@{new_version}",
+        ))
@@ -0,0 +1,36 @@
+"""
+Builders for small real documents shared by the test modules.
+"""
+
+try:
+    import pymupdf as fitz
+except ImportError:
+    import fitz
+from docx import Document
+from pptx import Presentation
+from pptx.util import Inches
+
+
+def make_pdf(path, pages):
+    doc = fitz.open()
+    for number in range(pages):
+        page = doc.new_page()
+        page.insert_text((72, 72), f"Page {number} text")
+    doc.save(str(path))
+    doc.close()
+
+
+def make_pptx(path, slides):
+    prs = Presentation()
+    for number in range(slides):
+        slide = prs.slides.add_slide(prs.slide_layouts[6])
+        box = slide.shapes.add_textbox(Inches(1), Inches(1), Inches(4), Inches(1))
+        box.text_frame.text = f"Slide {number} text"
+    prs.save(str(path))
+
+
+def make_docx(path, paragraphs):
+    doc = Document()
+    for number in range(paragraphs):
+        doc.add_paragraph(f"Paragraph {number} text")
+    doc.save(str(path))
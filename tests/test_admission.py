@@ -0,0 +1,143 @@
+import unittest
+from pathlib import Path
+import tempfile
+import shutil
+import multiprocessing
+from unittest.mock import patch
+
+from document_extractor.admission import AdmissionController, current_rss, measure_usage
+from document_extractor.processor import DocumentProcessor
+
+MIB = 1024 * 1024
+
+
+class TestAdmissionController(unittest.TestCase):
+    def setUp(self):
+        self.controller = AdmissionController(memory_budget=200 * MIB, high_water=150 * MIB)
+
+    def test_estimate(self):
+        """Test estimates scale with size and type"""
+        self.assertLess(self.controller.estimate('pdf', 10 * MIB), self.controller.estimate('pptx', 10 * MIB))
+        self.assertLess(self.controller.estimate('pdf', MIB), self.controller.estimate('pdf', 10 * MIB))
+
+    @patch('document_extractor.admission.worker_pids', return_value=[])
+    @patch('document_extractor.admission.current_rss', return_value=10 * MIB)
+    def test_budget_and_high_water(self, mock_rss, mock_pids):
+        """Test admission stops at the budget and the high-water mark"""
+        estimate = self.controller.estimate('pdf', 20 * MIB)  # 76 MiB
+        self.assertTrue(self.controller.can_admit(estimate))
+        self.controller.admit('a', 'pdf', 20 * MIB, estimate)
+        self.assertTrue(self.controller.can_admit(estimate))
+        self.controller.admit('b', 'pdf', 20 * MIB, estimate)
+        self.assertFalse(self.controller.can_admit(estimate))
+        self.assertEqual(self.controller.deferred, 1)
+
+        # A running worker with high RSS blocks admission even for tiny files
+        mock_pids.return_value = [1]
+        mock_rss.side_effect = lambda pid=None: 160 * MIB if pid == 1 else 10 * MIB
+        self.controller.release('a', {"pid": 1, "rss": 20 * MIB, "peak_delta": None})
+        self.assertFalse(self.controller.can_admit(self.controller.estimate('pdf', 0)))
+
+        # Where live RSS cannot be read, the worker's last report is used
+        mock_rss.side_effect = lambda pid=None: None if pid == 1 else 10 * MIB
+        self.assertTrue(self.controller.can_admit(self.controller.estimate('pdf', 0)))
+        self.controller.release('b', {"pid": 1, "rss": 160 * MIB, "peak_delta": None})
+        self.controller.admit('b', 'pdf', 20 * MIB, estimate)
+        self.assertFalse(self.controller.can_admit(self.controller.estimate('pdf', 0)))
+
+        # With nothing in flight a document is always admitted
+        self.controller.release('b')
+        self.assertTrue(self.controller.can_admit(10 * estimate))
+
+    def test_calibration(self):
+        """Test factors move toward observed peaks"""
+        before = self.controller.factors['pdf']
+        for _ in range(20):
+            self.controller.calibrate('pdf', 10 * MIB, AdmissionController.BASE_OVERHEAD + 10 * 10 * MIB)
+        self.assertGreater(self.controller.factors['pdf'], before)
+        self.assertAlmostEqual(self.controller.factors['pdf'], 10.0, places=1)
+
+        # Small files do not affect calibration
+        self.controller.calibrate('docx', 1024, 500 * MIB)
+        self.assertEqual(self.controller.factors['docx'], AdmissionController.DEFAULT_FACTORS['docx'])
+
+    def test_measure_usage(self):
+        """Test usage report from a measured call"""
+        result, usage = measure_usage(lambda n: bytearray(n), 4 * MIB)
+        self.assertEqual(len(result), 4 * MIB)
+        self.assertIn('pid', usage)
+        if usage['peak_delta'] is not None:
+            self.assertGreaterEqual(usage['peak_delta'], 0)
+
+    def test_repeated_allocations_keep_calibration(self):
+        """Test same-size allocations after the first are not measured as using no memory"""
+        for _ in range(8):
+            _, usage = measure_usage(lambda n: len(b"x" * n), 100 * MIB)
+            if usage['peak_delta'] is not None:
+                self.assertGreater(usage['peak_delta'], 90 * MIB)
+            self.controller.admit('doc', 'pdf', 20 * MIB, 0)
+            self.controller.release('doc', usage)
+        self.assertGreaterEqual(self.controller.factors['pdf'], AdmissionController.DEFAULT_FACTORS['pdf'])
+
+    @patch('document_extractor.admission.reset_high_water', return_value=False)
+    @patch('document_extractor.admission.peak_rss', return_value=500 * MIB)
+    def test_unmeasured_peak_is_skipped(self, mock_peak, mock_reset):
+        """Test a call that sets no new lifetime peak reports no peak and does not calibrate"""
+        _, usage = measure_usage(lambda n: len(b"x" * n), 10 * MIB)
+        self.assertIsNone(usage['peak_delta'])
+
+        self.controller.admit('doc', 'pdf', 20 * MIB, 0)
+        self.controller.release('doc', usage)
+        self.assertEqual(self.controller.factors['pdf'], AdmissionController.DEFAULT_FACTORS['pdf'])
+
+
+def hold_memory(size, ready, done):
+    data = b"x" * size
+    ready.set()
+    done.wait(30)
+    return len(data)
+
+
+class TestLiveWorkerRSS(unittest.TestCase):
+    @unittest.skipIf(current_rss() is None, "RSS cannot be measured on this platform")
+    def test_running_worker_blocks_admission(self):
+        """Test a worker's memory counts while it is still working on a document"""
+        ready, done = multiprocessing.Event(), multiprocessing.Event()
+        controller = AdmissionController(memory_budget=10 ** 12, high_water=current_rss() + 100 * MIB)
+        controller.admit('running', 'pdf', 0, 0)
+        self.assertTrue(controller.can_admit(0))
+
+        worker = multiprocessing.Process(target=hold_memory, args=(200 * MIB, ready, done))
+        worker.start()
+        try:
+            self.assertTrue(ready.wait(30))
+            self.assertFalse(controller.can_admit(0))
+            self.assertGreater(controller.peak_measured, 200 * MIB)
+        finally:
+            done.set()
+            worker.join()
+        self.assertTrue(controller.can_admit(0))
+
+
+class TestAdmissionProcessing(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        for index in range(6):
+            (Path(self.temp_dir) / f'test{index}.pdf').write_bytes(b'PDF content')
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_tight_budget_processes_all_files(self):
+        """Test a budget that admits one document at a time still completes the run"""
+        controller = AdmissionController(memory_budget=1)
+        processor = DocumentProcessor(admission=controller)
+        results = list(processor.process_documents(self.temp_dir, max_workers=3))
+
+        self.assertEqual(len(results), 6)
+        self.assertGreater(controller.deferred, 0)
+        self.assertEqual(controller._in_flight, {})
+
+
+if __name__ == '__main__':
+    unittest.main()
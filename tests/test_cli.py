@@ -0,0 +1,190 @@
+import unittest
+from pathlib import Path
+import io
+import json
+import os
+import tempfile
+import shutil
+import subprocess
+import sys
+import time
+from unittest.mock import patch
+
+from document_extractor.cli import main, parse_size, read_path_list, EXIT_OK, EXIT_FAILURES
+from tests.helpers import make_pdf
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+def fake_extract(ctx, budget=None):
+    return ctx.result(content="Extracted text")
+
+
+class TestCLIHelpers(unittest.TestCase):
+    def test_parse_size(self):
+        """Test byte size parsing"""
+        self.assertEqual(parse_size("512"), 512)
+        self.assertEqual(parse_size("64K"), 64 * 1024)
+        self.assertEqual(parse_size("1.5g"), int(1.5 * 1024 ** 3))
+        self.assertEqual(parse_size("10MB"), 10 * 1024 ** 2)
+
+    def test_budget_limits_must_be_positive(self):
+        """Test zero and negative extraction budgets are usage errors"""
+        for option in ('--max-pages=0', '--max-chars=-3', '--max-bytes=0'):
+            with self.assertRaises(SystemExit) as raised, patch('sys.stderr', io.StringIO()):
+                main(['.', option])
+            self.assertEqual(raised.exception.code, 2)
+
+    def test_read_path_list(self):
+        """Test newline and NUL delimited path lists"""
+        stream = io.BytesIO(b"a.pdf\r\nb dir/c.docx\n\nd.pptx")
+        self.assertEqual(list(read_path_list(stream, chunk_size=3)), ["a.pdf", "b dir/c.docx", "d.pptx"])
+
+        stream = io.BytesIO(b"a\nb.pdf\0c.pdf\0")
+        self.assertEqual(list(read_path_list(stream, null=True, chunk_size=4)), ["a\nb.pdf", "c.pdf"])
+
+
+class TestCLI(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        for name in ['test1.pdf', 'test2.pdf', 'notes.txt', 'subdir/test3.pdf']:
+            file_path = Path(self.temp_dir) / name
+            file_path.parent.mkdir(parents=True, exist_ok=True)
+            file_path.write_bytes(b'PDF content')
+        self.output = Path(self.temp_dir) / 'out' / 'results.ndjson'
+        self.summary = Path(self.temp_dir) / 'summary.json'
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def read_output(self):
+        records = [json.loads(line) for line in self.output.read_text().splitlines()]
+        return records, json.loads(self.summary.read_text())
+
+    @patch('document_extractor.extractors.pdf.PDFExtractor.extract', side_effect=fake_extract)
+    def test_directory_input(self, mock_extract):
+        """Test directory discovery with NDJSON output"""
+        code = main([self.temp_dir, '-r', '-o', str(self.output), '--summary', str(self.summary)])
+        records, summary = self.read_output()
+
+        self.assertEqual(code, EXIT_OK)
+        self.assertEqual(len(records), 3)
+        self.assertTrue(all(r['content'] == "Extracted text" for r in records))
+        self.assertEqual(summary['documents'], 3)
+        self.assertEqual(summary['failed'], 0)
+
+    @patch('document_extractor.extractors.pdf.PDFExtractor.extract', side_effect=fake_extract)
+    def test_path_list_input(self, mock_extract):
+        """Test NUL-delimited path list skips discovery and reports failures"""
+        path_list = Path(self.temp_dir) / 'paths'
+        names = ['test1.pdf', 'notes.txt', 'missing.pdf']
+        path_list.write_bytes(b"\0".join(str(Path(self.temp_dir) / n).encode() for n in names))
+
+        code = main(['--files-from', str(path_list), '-0', '-o', str(self.output), '--summary', str(self.summary)])
+        records, summary = self.read_output()
+
+        self.assertEqual(code, EXIT_FAILURES)
+        self.assertEqual(mock_extract.call_count, 1)
+        self.assertEqual(len(records), 2)
+        self.assertEqual(summary['succeeded'], 1)
+        self.assertEqual(summary['failed'], 1)
+        self.assertEqual(summary['skipped'], 1)
+        missing = next(r for r in records if r['file_name'] == 'missing.pdf')
+        self.assertIn("File not found", missing['error'])
+        self.assertIsNone(missing['date_created'])
+
+    @patch('document_extractor.extractors.pdf.PDFExtractor.extract', side_effect=fake_extract)
+    def test_max_file_size(self, mock_extract):
+        """Test per-file size limit"""
+        (Path(self.temp_dir) / 'big.pdf').write_bytes(b'x' * 2048)
+
+        code = main([self.temp_dir, '--max-file-size', '1K', '-o', str(self.output), '--summary', str(self.summary)])
+        records, summary = self.read_output()
+
+        self.assertEqual(code, EXIT_FAILURES)
+        big = next(r for r in records if r['file_name'] == 'big.pdf')
+        self.assertIn("exceeds size limit", big['error'])
+        self.assertEqual(mock_extract.call_count, 2)
+
+    def test_concurrent_workers(self):
+        """Test multi-process extraction returns one record per file"""
+        code = main([self.temp_dir, '-r', '-j', '2', '-o', str(self.output), '--summary', str(self.summary)])
+        records, summary = self.read_output()
+
+        self.assertEqual(code, EXIT_FAILURES)  # Test files are not valid PDFs
+        self.assertEqual(sorted(r['file_name'] for r in records), ['test1.pdf', 'test2.pdf', 'test3.pdf'])
+        self.assertEqual(summary['documents'], 3)
+
+    @patch('document_extractor.extractors.pdf.PDFExtractor.extract')
+    def test_worker_crash(self, mock_extract):
+        """Test a worker that dies is reported as failures and the run continues on a new pool"""
+        def extract(ctx, budget=None):
+            if ctx.path.name == 'crash.pdf':
+                os._exit(1)
+            # Keep healthy documents in flight long enough for the crash to be seen
+            time.sleep(0.1)
+            return ctx.result(content="text")
+        mock_extract.side_effect = extract
+        paths = [Path(self.temp_dir) / 'crash.pdf'] + [Path(self.temp_dir) / f'more{n}.pdf' for n in range(9)]
+        for path in paths:
+            path.write_bytes(b'PDF content')
+        path_list = Path(self.temp_dir) / 'paths.txt'
+        path_list.write_text("\n".join(map(str, paths)))
+
+        code = main(['-T', str(path_list), '-j', '2', '-o', str(self.output), '--summary', str(self.summary)])
+        records, summary = self.read_output()
+
+        self.assertEqual(code, EXIT_FAILURES)
+        self.assertEqual(summary['documents'], 10)
+        self.assertEqual(summary['worker_pool_restarts'], 1)
+        crashed = next(r for r in records if r['file_name'] == 'crash.pdf')
+        self.assertIn("Worker process terminated", crashed['error'])
+        # Documents submitted after the restart are extracted normally
+        self.assertGreater(sum(r['error'] is None for r in records), 0)
+
+
+class TestCLIProcess(unittest.TestCase):
+    """Runs the command as a subprocess to check the raw output streams."""
+
+    def setUp(self):
+        self.temp_dir = Path(tempfile.mkdtemp())
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def run_cli(self, *args, **kwargs):
+        return subprocess.Popen(
+            [sys.executable, '-m', 'document_extractor', *args],
+            cwd=REPO_ROOT, stdout=subprocess.PIPE, stderr=subprocess.PIPE, **kwargs
+        )
+
+    def test_stdout_is_ndjson(self):
+        """Test every stdout line is a JSON record"""
+        make_pdf(self.temp_dir / 'doc.pdf', 2)
+        (self.temp_dir / 'broken.pdf').write_bytes(b'not a pdf')
+
+        stdout, stderr = self.run_cli(str(self.temp_dir)).communicate(timeout=60)
+        lines = stdout.decode('utf-8').splitlines()
+
+        self.assertEqual(len(lines), 2)
+        records = [json.loads(line) for line in lines]
+        self.assertEqual(sorted(r['file_name'] for r in records), ['broken.pdf', 'doc.pdf'])
+        self.assertEqual(json.loads(stderr.decode('utf-8').splitlines()[-1])['documents'], 2)
+
+    def test_closed_pipe(self):
+        """Test a reader closing the pipe early stops the run without a traceback"""
+        path_list = self.temp_dir / 'paths.txt'
+        path_list.write_text("\n".join(str(self.temp_dir / f'missing{n}.pdf') for n in range(5000)))
+
+        process = self.run_cli('-T', str(path_list))
+        json.loads(process.stdout.readline())
+        process.stdout.close()
+        stderr = process.stderr.read().decode('utf-8')
+        process.wait(timeout=60)
+
+        self.assertNotIn("Traceback", stderr)
+        self.assertEqual(process.returncode, EXIT_FAILURES)
+
+
+if __name__ == '__main__':
+    unittest.main()
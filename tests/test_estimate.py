@@ -0,0 +1,114 @@
+import unittest
+from pathlib import Path
+import json
+import io
+import tempfile
+import shutil
+from unittest.mock import patch
+
+from document_extractor.cli import main
+from document_extractor.estimate import CostEstimator, estimate_corpus, load_calibration
+from tests.helpers import make_pdf, make_docx
+
+
+class TestCostEstimator(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = Path(tempfile.mkdtemp())
+        for index in range(4):
+            make_pdf(self.temp_dir / f'doc{index}.pdf', index + 1)
+        make_docx(self.temp_dir / 'report.docx', 3)
+        self.paths = sorted(self.temp_dir.glob('*.*'))
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_uncalibrated_estimate(self):
+        """Test estimates from stat data alone"""
+        estimate = estimate_corpus(str(self.temp_dir), worker_counts=(1, 2, 8))
+
+        self.assertEqual(estimate['documents'], 5)
+        self.assertEqual(estimate['per_type']['pdf']['documents'], 4)
+        self.assertEqual(estimate['calibration_samples'], 0)
+        self.assertEqual(set(estimate['runtime_seconds']), {'1', '2', '8'})
+        self.assertEqual(set(estimate['output_bytes']), {'ndjson', 'json'})
+        ranges = [estimate['cpu_seconds']] + list(estimate['output_bytes'].values())
+        for values in ranges + list(estimate['peak_memory_bytes'].values()):
+            self.assertLessEqual(values['low'], values['estimate'])
+            self.assertLessEqual(values['estimate'], values['high'])
+        # More workers never need less memory
+        memory = estimate['peak_memory_bytes']
+        for key in ('estimate', 'low', 'high'):
+            self.assertLessEqual(memory['1'][key], memory['2'][key])
+        self.assertEqual(memory['8'], estimate_corpus(str(self.temp_dir), worker_counts=(5,))['peak_memory_bytes']['5'])
+
+    def test_calibration_scales_estimate(self):
+        """Test timing records from a previous run calibrate the model"""
+        baseline = CostEstimator().estimate(self.paths)
+
+        estimator = CostEstimator()
+        records = []
+        for path in self.paths:
+            file_type = path.suffix.lstrip('.')
+            records.append({
+                'file_type': file_type,
+                'file_size': path.stat().st_size,
+                'duration_seconds': 10 * estimator._predict_seconds(file_type, path.stat().st_size),
+                'content': 'x' * 10,
+                'error': None,
+            })
+        calibration = self.temp_dir / 'previous.ndjson'
+        calibration.write_text("\n".join(json.dumps(r) for r in records))
+
+        self.assertEqual(estimator.add_samples(load_calibration(calibration)), 5)
+
+        # A single-record NDJSON file is one record, not a {"documents": [...]} file
+        calibration.write_text(json.dumps(records[0]) + "\n")
+        self.assertEqual(len(load_calibration(calibration)), 1)
+        estimate = estimator.estimate(self.paths)
+        self.assertAlmostEqual(estimate['cpu_seconds']['estimate'], 10 * baseline['cpu_seconds']['estimate'], places=2)
+        self.assertEqual(estimate['per_type']['pdf']['calibration_samples'], 4)
+
+    def test_sampling(self):
+        """Test sampling runs real extractors"""
+        estimator = CostEstimator()
+        self.assertEqual(estimator.sample(self.paths, 3, seed=1), 3)
+        self.assertEqual(estimator.estimate(self.paths)['calibration_samples'], 3)
+
+    def test_memory_range_from_samples(self):
+        """Test sampled peaks move and narrow the memory range"""
+        estimator = CostEstimator()
+        pdfs = [p for p in self.paths if p.suffix == '.pdf']
+
+        def measured(func, path):
+            peak = 2 * estimator.memory.estimate('pdf', path.stat().st_size)
+            return func(path), {"pid": 0, "rss": None, "peak_delta": peak}
+
+        with patch('document_extractor.estimate.measure_usage', side_effect=measured):
+            self.assertEqual(estimator.sample(pdfs, 4), 4)
+        uncalibrated = CostEstimator().estimate(pdfs, worker_counts=[1])['peak_memory_bytes']['1']
+        calibrated = estimator.estimate(pdfs, worker_counts=[1])['peak_memory_bytes']['1']
+
+        self.assertGreater(calibrated['estimate'], uncalibrated['estimate'])
+        self.assertLess(calibrated['high'] - calibrated['low'], uncalibrated['high'] - uncalibrated['low'])
+
+    def test_cli_dry_run(self):
+        """Test the CLI dry run and its argument validation"""
+        output = self.temp_dir / 'estimate.json'
+        summary_path = self.temp_dir / 'summary.json'
+        calibration = self.temp_dir / 'previous.ndjson'
+        argv = [str(self.temp_dir), '--dry-run', '-o', str(output), '--summary', str(summary_path)]
+
+        self.assertEqual(main(argv + ['--sample', '2', '--seed', '1']), 0)
+        self.assertEqual(json.loads(output.read_text())['documents'], 5)
+        self.assertEqual(json.loads(summary_path.read_text())['sampled'], 2)
+
+        calibration.write_text("not json\n")
+        for extra in (['--sample=-1'], ['--calibration', str(self.temp_dir / 'missing.ndjson')],
+                      ['--calibration', str(calibration)]):
+            with self.assertRaises(SystemExit) as raised, patch('sys.stderr', io.StringIO()):
+                main(argv + extra)
+            self.assertEqual(raised.exception.code, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
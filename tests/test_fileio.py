@@ -0,0 +1,103 @@
+import unittest
+from pathlib import Path
+import hashlib
+import json
+import tempfile
+import shutil
+
+from document_extractor.cli import main
+from document_extractor.fileio import FileContext
+from document_extractor.processor import DocumentProcessor
+from document_extractor.extractors.pdf import PDFExtractor
+from document_extractor.extractors.pptx import PPTXExtractor
+from document_extractor.extractors.docx import DOCXExtractor
+from tests.helpers import make_pdf, make_pptx, make_docx
+
+
+class TestFileContext(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = Path(tempfile.mkdtemp())
+        make_pdf(self.temp_dir / 'doc.pdf', 2)
+        make_pptx(self.temp_dir / 'deck.pptx', 2)
+        make_docx(self.temp_dir / 'report.docx', 2)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_single_stat_and_read(self):
+        """Test stat, data, hash and result share one stat and one read"""
+        path = self.temp_dir / 'doc.pdf'
+        with FileContext(path) as ctx:
+            self.assertEqual(ctx.size, path.stat().st_size)
+            self.assertEqual(ctx.sha256(), hashlib.sha256(path.read_bytes()).hexdigest())
+            result = PDFExtractor.extract(ctx)
+            self.assertIsNone(result.error)
+            self.assertEqual(result.file_size, ctx.size)
+            self.assertEqual(ctx.counters['stat_calls'], 1)
+            self.assertEqual(ctx.counters['read_calls'], 1)
+            self.assertEqual(ctx.counters['bytes_read'], ctx.size)
+
+    def test_mmap_parsing(self):
+        """Test every extractor parses memory-mapped files"""
+        for name, extractor, expected in [
+            ('doc.pdf', PDFExtractor, "Page 1 text"),
+            ('deck.pptx', PPTXExtractor, "Slide 1 text"),
+            ('report.docx', DOCXExtractor, "Paragraph 1 text"),
+        ]:
+            with FileContext(self.temp_dir / name, mmap_threshold=1) as ctx:
+                result = extractor.extract(ctx)
+                self.assertIsNone(result.error, name)
+                self.assertIn(expected, result.content)
+                self.assertEqual(ctx.counters['mmaps'], 1)
+                self.assertEqual(ctx.counters['read_calls'], 0)
+
+    def test_processor_io_counters(self):
+        """Test the processor touches each file with one stat and one read"""
+        processor = DocumentProcessor(hash_files=True)
+        results = list(processor.process_documents(str(self.temp_dir)))
+
+        self.assertEqual(len(results), 3)
+        self.assertTrue(all(r['error'] is None and r['file_sha256'] for r in results))
+        self.assertEqual(processor.io_counters['stat_calls'], 3)
+        self.assertEqual(processor.io_counters['read_calls'], 3)
+        total = sum(p.stat().st_size for p in self.temp_dir.iterdir())
+        self.assertEqual(processor.io_counters['bytes_read'], total)
+
+    def test_triage_io_counters(self):
+        """Test triage stats each file once through its FileContext"""
+        processor = DocumentProcessor()
+        results = list(processor.triage_documents(str(self.temp_dir)))
+
+        self.assertEqual(len(results), 3)
+        self.assertTrue(all(r['opens'] for r in results))
+        self.assertEqual(processor.io_counters['stat_calls'], 3)
+
+    def test_cli_io_counters(self):
+        """Test discovery, admission and workers share one counted stat per file"""
+        output_dir = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, output_dir)
+        summary_path = output_dir / 'summary.json'
+        path_list = output_dir / 'paths.txt'
+        path_list.write_text("\n".join(str(p) for p in sorted(self.temp_dir.iterdir())))
+        common = ['-o', str(output_dir / 'records.ndjson'), '--summary', str(summary_path),
+                  '--workers', '2', '--memory-budget', '4G']
+
+        for argv in ([str(self.temp_dir), '--detect-types'], [str(self.temp_dir), '--triage'],
+                     ['--files-from', str(path_list)], ['--files-from', str(path_list), '--detect-types']):
+            self.assertEqual(main(argv + common), 0, argv)
+            summary = json.loads(summary_path.read_text())
+            self.assertEqual(summary['documents'], 3, argv)
+            self.assertEqual(summary['io']['stat_calls'], 3, argv)
+
+    def test_missing_and_corrupt_files(self):
+        """Test errors are reported without raising"""
+        result = PDFExtractor.extract(self.temp_dir / 'missing.pdf')
+        self.assertIn("File not found", result.error)
+
+        (self.temp_dir / 'bad.docx').write_bytes(b'not a zip')
+        result = DOCXExtractor.extract(self.temp_dir / 'bad.docx')
+        self.assertEqual(result.error, "Invalid or corrupted DOCX file")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,212 @@
+import unittest
+from pathlib import Path
+import json
+import os
+import tempfile
+import shutil
+import zipfile
+
+from document_extractor.admission import AdmissionController
+from document_extractor.cli import main
+from document_extractor.estimate import CostEstimator
+from document_extractor.fileio import FileContext
+from document_extractor.processor import DocumentProcessor
+from document_extractor.sniff import HEAD_SIZE, UNREADABLE, TypeSniffer, detect_type
+from tests.helpers import make_pdf, make_pptx, make_docx
+
+
+class TestDetectType(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = Path(tempfile.mkdtemp())
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_detects_by_content(self):
+        """Test types are detected from content regardless of suffix"""
+        make_pdf(self.temp_dir / 'a.bin', 1)
+        make_pptx(self.temp_dir / 'b.pdf', 1)
+        make_docx(self.temp_dir / 'c', 1)
+        (self.temp_dir / 'd.docx').write_text("not a document")
+        with zipfile.ZipFile(self.temp_dir / 'e.docx', 'w') as archive:
+            archive.writestr('readme.txt', "plain zip")
+
+        for name, expected in [('a.bin', 'pdf'), ('b.pdf', 'pptx'), ('c', 'docx'), ('d.docx', None), ('e.docx', None)]:
+            with FileContext(self.temp_dir / name) as ctx:
+                self.assertEqual(detect_type(ctx), expected, name)
+                self.assertFalse(ctx.loaded)
+
+    def test_main_part_in_central_directory(self):
+        """Test a package whose main part is stored after large entries is found via the central directory"""
+        path = self.temp_dir / 'large'
+        with zipfile.ZipFile(path, 'w') as archive:
+            archive.writestr('[Content_Types].xml', os.urandom(3 * HEAD_SIZE))
+            archive.writestr('word/document.xml', "<w:document/>")
+
+        with FileContext(path) as ctx:
+            self.assertEqual(detect_type(ctx), 'docx')
+            self.assertEqual(ctx.counters['read_calls'], 2)
+            self.assertFalse(ctx.loaded)
+
+
+class TestTypeDetection(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = Path(tempfile.mkdtemp())
+        make_pdf(self.temp_dir / 'report.PDF.bak', 1)
+        make_docx(self.temp_dir / 'renamed.pdf', 2)
+        make_pptx(self.temp_dir / 'deck', 1)
+        (self.temp_dir / 'notes.docx').write_text("plain text " * 1000)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_default_uses_suffix(self):
+        """Test suffix-based discovery is unchanged without detection"""
+        results = {Path(r['file_path']).name: r for r in DocumentProcessor().process_documents(str(self.temp_dir))}
+
+        self.assertEqual(set(results), {'renamed.pdf', 'notes.docx'})
+        self.assertEqual(results['renamed.pdf']['file_type'], 'pdf')
+
+    def test_extracts_by_detected_type(self):
+        """Test mismatched and missing extensions are dispatched by content"""
+        processor = DocumentProcessor(detect_types=True)
+        results = {Path(r['file_path']).name: r for r in processor.process_documents(str(self.temp_dir))}
+
+        self.assertEqual(set(results), {'report.PDF.bak', 'renamed.pdf', 'deck'})
+        self.assertEqual(results['renamed.pdf']['file_type'], 'docx')
+        self.assertIn("Paragraph 1 text", results['renamed.pdf']['content'])
+        self.assertEqual(results['report.PDF.bak']['file_type'], 'pdf')
+        self.assertIn("Page 0 text", results['report.PDF.bak']['content'])
+        self.assertEqual(results['deck']['file_type'], 'pptx')
+        self.assertTrue(all(r['error'] is None for r in results.values()))
+
+    def test_rejects_non_document_before_parsing(self):
+        """Test an explicitly listed non-document fails from its header alone"""
+        processor = DocumentProcessor(detect_types=True)
+        path = self.temp_dir / 'notes.docx'
+        with FileContext(path) as ctx:
+            self.assertIsNone(processor.sniffer.detect(ctx))
+            self.assertEqual(ctx.counters['bytes_read'], HEAD_SIZE)
+
+        result = processor._process_single_document(path)
+        self.assertIn("Not a supported document", result.error)
+
+    def test_path_list_skips_non_documents(self):
+        """Test listed directories and non-documents are skipped and unreadable paths reported"""
+        output = self.temp_dir / 'records.ndjson'
+        summary_path = self.temp_dir / 'summary.json'
+        path_list = self.temp_dir / 'paths.txt'
+        (self.temp_dir / 'subdir').mkdir()
+        listed = [self.temp_dir / 'subdir', self.temp_dir / 'deck', self.temp_dir / 'notes.docx']
+        path_list.write_text("\n".join(map(str, listed)))
+        argv = ['--files-from', str(path_list), '--detect-types', '-o', str(output), '--summary', str(summary_path)]
+
+        # As produced by `find DIR -print0`: the directory itself and a non-document
+        self.assertEqual(main(argv), 0)
+        records = [json.loads(line) for line in output.read_text().splitlines()]
+        self.assertEqual([Path(r['file_path']).name for r in records], ['deck'])
+        self.assertEqual(json.loads(summary_path.read_text())['skipped'], 2)
+
+        path_list.write_text("\n".join(map(str, listed + [self.temp_dir / 'missing.pdf'])))
+        self.assertEqual(main(argv), 1)
+        records = {Path(r['file_path']).name: r for r in map(json.loads, output.read_text().splitlines())}
+        self.assertEqual(set(records), {'deck', 'missing.pdf'})
+        self.assertIn("File not found", records['missing.pdf']['error'])
+        self.assertEqual(json.loads(summary_path.read_text())['skipped'], 2)
+
+        # Files detected as another type are still filtered by --types
+        main(argv + ['-t', 'pdf'])
+        self.assertEqual(json.loads(summary_path.read_text())['skipped'], 3)
+
+    def test_triage_uses_detected_type(self):
+        """Test triage reports and inspects the detected type"""
+        processor = DocumentProcessor(detect_types=True)
+        results = {Path(r['file_path']).name: r for r in processor.triage_documents(str(self.temp_dir))}
+
+        self.assertEqual(results['renamed.pdf']['file_type'], 'docx')
+        self.assertTrue(results['renamed.pdf']['opens'])
+        self.assertEqual(results['deck']['page_count'], 1)
+
+    def test_estimates_use_detected_type(self):
+        """Test cost and memory estimates are keyed on the detected type"""
+        processor = DocumentProcessor(detect_types=True)
+        paths = list(processor._find_documents(self.temp_dir))
+        estimate = CostEstimator(processor).estimate(paths, worker_counts=[1])
+        self.assertEqual(set(estimate['per_type']), {'pdf', 'docx', 'pptx'})
+
+        controller = AdmissionController(memory_budget=1)
+        path = self.temp_dir / 'report.PDF.bak'
+        self.assertEqual(controller.estimate_path(path, processor._document_type(path))[0], 'pdf')
+        self.assertEqual(controller.estimate_path(path)[0], 'bak')
+
+    def test_cache_skips_unchanged_files(self):
+        """Test a second scan reuses cached types without reading and rescans changed files"""
+        processor = DocumentProcessor(detect_types=True)
+        list(processor._find_documents(self.temp_dir))
+        self.assertEqual(processor.sniffer.misses, 4)
+
+        processor.io_counters.clear()
+        list(processor._find_documents(self.temp_dir))
+        self.assertEqual(processor.sniffer.hits, 4)
+        self.assertEqual(processor.io_counters.get('read_calls', 0), 0)
+
+        make_pdf(self.temp_dir / 'deck', 1)
+        found = {p.name for p in processor._find_documents(self.temp_dir, file_types=['pdf'])}
+        self.assertEqual(found, {'report.PDF.bak', 'deck'})
+        self.assertEqual(processor.sniffer.misses, 5)
+
+    def test_unreadable_distinct_from_non_document(self):
+        """Test missing files are reported as unreadable and directories as non-documents"""
+        sniffer = TypeSniffer()
+        (self.temp_dir / 'subdir').mkdir()
+        with FileContext(self.temp_dir / 'missing.pdf') as ctx:
+            self.assertEqual(sniffer.detect(ctx), UNREADABLE)
+        with FileContext(self.temp_dir / 'subdir') as ctx:
+            self.assertIsNone(sniffer.detect(ctx))
+        with FileContext(self.temp_dir / 'notes.docx') as ctx:
+            self.assertIsNone(sniffer.detect(ctx))
+
+    def test_cache_round_trip(self):
+        """Test a saved cache is reused by a new sniffer"""
+        cache_path = self.temp_dir / 'cache' / 'types.json'
+        first = TypeSniffer()
+        with FileContext(self.temp_dir / 'deck') as ctx:
+            self.assertEqual(first.detect(ctx), 'pptx')
+        first.save(cache_path)
+
+        second = TypeSniffer()
+        second.load(cache_path)
+        second.load(self.temp_dir / 'missing.json')
+        with FileContext(self.temp_dir / 'deck') as ctx:
+            self.assertEqual(second.detect(ctx), 'pptx')
+            self.assertEqual(ctx.counters['read_calls'], 0)
+        self.assertEqual(second.hits, 1)
+
+    def test_cli_type_cache(self):
+        """Test the CLI detects types and persists the cache between runs"""
+        cache_path = self.temp_dir / 'types.json'
+        output = self.temp_dir / 'out' / 'records.ndjson'
+        summary_path = self.temp_dir / 'out' / 'summary.json'
+        source = self.temp_dir / 'docs'
+        source.mkdir()
+        for name in ('report.PDF.bak', 'renamed.pdf', 'deck', 'notes.docx'):
+            (self.temp_dir / name).rename(source / name)
+        argv = [str(source), '--detect-types', '--type-cache', str(cache_path),
+                '-o', str(output), '--summary', str(summary_path)]
+
+        self.assertEqual(main(argv), 0)
+        records = [json.loads(line) for line in output.read_text().splitlines()]
+        self.assertEqual(len(records), 3)
+        self.assertTrue(cache_path.exists())
+
+        self.assertEqual(main(argv), 0)
+        summary = json.loads(summary_path.read_text())
+        self.assertEqual(summary['type_detection']['cache_misses'], 0)
+        self.assertGreater(summary['type_detection']['cache_hits'], 0)
+
+        with self.assertRaises(SystemExit):
+            main([str(source), '--type-cache', str(cache_path)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,142 @@
+import unittest
+from pathlib import Path
+import json
+import tempfile
+import shutil
+from unittest.mock import patch
+
+from document_extractor.cli import main
+from document_extractor.store import OutputStore
+
+
+def record(path, content, modified="2025-01-01T00:00:00"):
+    return {
+        "file_path": path,
+        "file_name": Path(path).name,
+        "file_type": "pdf",
+        "date_created": "2025-01-01T00:00:00",
+        "date_modified": modified,
+        "extraction_time": "2025-02-01T00:00:00",
+        "content": content,
+        "error": None,
+    }
+
+
+class TestOutputStore(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.store = OutputStore(self.temp_dir / 'store', snapshot_interval=3)
+        self.long_text = "".join(f"Line {n} of a long document\n" for n in range(200))
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_versions_and_reconstruction(self):
+        """Test deltas, references, tombstones and reconstruction of every version"""
+        runs = [
+            [record('/a.pdf', self.long_text), record('/b.pdf', "short"), record('/c.pdf', "gone soon")],
+            [record('/a.pdf', self.long_text + "Appended\r\n", "2025-01-02T00:00:00"), record('/b.pdf', "short")],
+            [record('/a.pdf', self.long_text + "Appended\r\n", "2025-01-02T00:00:00"), record('/b.pdf', "short"),
+             record('/d.pdf', "new")],
+            [record('/a.pdf', "Edited\n" + self.long_text, "2025-01-03T00:00:00"), record('/b.pdf', "short")],
+        ]
+        for run in runs:
+            self.store.commit(run)
+        self.assertEqual(self.store.versions(), [1, 2, 3, 4])
+
+        stats = self.store.last_commit_stats
+        self.assertEqual((stats['modified'], stats['unchanged'], stats['deleted']), (1, 1, 1))
+
+        # Reconstruct from a fresh instance so no cached state is used
+        store = OutputStore(self.temp_dir / 'store')
+        for version, run in enumerate(runs, start=1):
+            documents = store.load(version)['documents']
+            expected = sorted(run, key=lambda r: r['file_path'])
+            self.assertEqual([(d['file_path'], d['content']) for d in documents],
+                             [(r['file_path'], r['content']) for r in expected])
+
+        self.assertEqual(store.diff(1, 2), {"added": [], "removed": ['/c.pdf'], "modified": ['/a.pdf']})
+        self.assertEqual(store.diff(2, 3)["added"], ['/d.pdf'])
+        self.assertIn("+Appended", store.diff_content('/a.pdf', 1, 2))
+
+    def test_storage_grows_with_churn(self):
+        """Test unchanged runs write only a small version file and edits write deltas"""
+        self.store = OutputStore(self.temp_dir / 'churn')
+        run = [record(f'/doc{n}.pdf', self.long_text + str(n)) for n in range(20)]
+        self.store.commit(run)
+        first = self.store.last_commit_stats['bytes_written']
+
+        self.store.commit(run)
+        self.assertEqual(self.store.last_commit_stats['unchanged'], 20)
+        self.assertLess(self.store.last_commit_stats['bytes_written'], 200)
+
+        run[0] = record('/doc0.pdf', self.long_text + "changed")
+        self.store.commit(run)
+        self.assertLess(self.store.last_commit_stats['bytes_written'], first / 20)
+        self.assertEqual(len(list((self.store.root / 'objects').glob('*/*.delta'))), 1)
+
+    def test_partial_commit(self):
+        """Test partial runs keep documents they do not mention"""
+        self.store.commit([record('/a.pdf', "a"), record('/b.pdf', "b")])
+        self.store.commit([record('/a.pdf', "a2")], partial=True)
+        self.assertEqual([d['content'] for d in self.store.documents()], ["a2", "b"])
+
+    def test_scoped_commit(self):
+        """Test only missing documents within the scope are tombstoned"""
+        self.store.commit([record('/a.pdf', "a"), record('/b.pdf', "b"), record('/c.pdf', "c")])
+        self.store.commit([record('/a.pdf', "a")], scope=lambda entry: entry['file_path'] != '/c.pdf')
+        self.assertEqual([d['file_path'] for d in self.store.documents()], ['/a.pdf', '/c.pdf'])
+        self.assertEqual(self.store.last_commit_stats['deleted'], 1)
+
+    @patch('document_extractor.extractors.docx.DOCXExtractor.extract',
+           side_effect=lambda ctx, budget=None: ctx.result(content="docx text"))
+    @patch('document_extractor.extractors.pdf.PDFExtractor.extract',
+           side_effect=lambda ctx, budget=None: ctx.result(content="pdf text"))
+    def test_cli_scope(self, mock_pdf, mock_docx):
+        """Test narrower directory runs do not tombstone documents outside their scope"""
+        docs = self.temp_dir / 'docs'
+        (docs / 'sub').mkdir(parents=True)
+        (docs / 'one.pdf').write_bytes(b'PDF content')
+        (docs / 'two.docx').write_bytes(b'DOCX content')
+        (docs / 'sub' / 'three.pdf').write_bytes(b'PDF content')
+        other = self.temp_dir / 'other'
+        other.mkdir()
+        (other / 'four.pdf').write_bytes(b'PDF content')
+        store_dir = self.temp_dir / 'cli_store'
+        summary_path = self.temp_dir / 'summary.json'
+
+        def run(*args):
+            main([*args, '--store', str(store_dir), '-o', str(self.temp_dir / 'out.ndjson'),
+                  '--summary', str(summary_path)])
+            return json.loads(summary_path.read_text())['store']
+
+        run(str(docs), '-r')
+        self.assertEqual(run(str(docs), '-r', '-t', 'pdf')['deleted'], 0)
+        self.assertEqual(run(str(docs))['deleted'], 0)
+        self.assertEqual(run(str(other))['deleted'], 0)
+        self.assertEqual(len(list(OutputStore(store_dir).documents())), 4)
+
+        (docs / 'sub' / 'three.pdf').unlink()
+        self.assertEqual(run(str(docs), '-r', '-t', 'pdf')['deleted'], 1)
+        self.assertEqual(len(list(OutputStore(store_dir).documents())), 3)
+
+    @patch('document_extractor.extractors.pdf.PDFExtractor.extract',
+           side_effect=lambda ctx, budget=None: ctx.result(content="text"))
+    def test_cli_store(self, mock_extract):
+        """Test the CLI records runs in the store"""
+        docs = self.temp_dir / 'docs'
+        docs.mkdir()
+        (docs / 'one.pdf').write_bytes(b'PDF content')
+        summary_path = self.temp_dir / 'summary.json'
+        args = [str(docs), '--store', str(self.temp_dir / 'cli_store'),
+                '-o', str(self.temp_dir / 'out.ndjson'), '--summary', str(summary_path)]
+
+        main(args)
+        main(args)
+        summary = json.loads(summary_path.read_text())
+        self.assertEqual(summary['store']['version'], 2)
+        self.assertEqual(summary['store']['unchanged'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,156 @@
+import unittest
+from pathlib import Path
+import tempfile
+import shutil
+from unittest.mock import patch
+
+import docx.table
+from docx import Document
+
+from document_extractor.models import ExtractionBudget
+from document_extractor.processor import DocumentProcessor
+from document_extractor.extractors.pdf import PDFExtractor
+from document_extractor.extractors.pptx import PPTXExtractor
+from document_extractor.extractors.docx import DOCXExtractor
+from tests.helpers import make_pdf, make_pptx, make_docx
+
+
+class TestTriage(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = Path(tempfile.mkdtemp())
+        make_pdf(self.temp_dir / 'doc.pdf', 3)
+        make_pptx(self.temp_dir / 'deck.pptx', 4)
+        make_docx(self.temp_dir / 'report.docx', 5)
+        (self.temp_dir / 'broken.pdf').write_bytes(b'not a pdf')
+        self.processor = DocumentProcessor()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_inspect(self):
+        """Test page and slide counts without text extraction"""
+        self.assertEqual(PDFExtractor.inspect(self.temp_dir / 'doc.pdf').page_count, 3)
+        self.assertEqual(PPTXExtractor.inspect(self.temp_dir / 'deck.pptx').page_count, 4)
+
+        info = DOCXExtractor.inspect(self.temp_dir / 'report.docx')
+        self.assertTrue(info.opens)
+        self.assertGreater(info.file_size, 0)
+
+        info = PDFExtractor.inspect(self.temp_dir / 'broken.pdf')
+        self.assertFalse(info.opens)
+        self.assertIsNotNone(info.error)
+
+    def test_office_file_named_pdf(self):
+        """Test an Office package with a .pdf suffix is not opened as a PDF"""
+        make_docx(self.temp_dir / 'renamed.pdf', 2)
+
+        info = PDFExtractor.inspect(self.temp_dir / 'renamed.pdf')
+        self.assertFalse(info.opens)
+        self.assertIn("Not a PDF file", info.error)
+        self.assertIn("Not a PDF file", PDFExtractor.extract(self.temp_dir / 'renamed.pdf').error)
+
+    def test_file_vanishes_during_inspect(self):
+        """Test a file removed while it is being inspected yields an error record"""
+        def vanish(path):
+            def side_effect(*args, **kwargs):
+                path.unlink()
+                raise OSError("gone")
+            return side_effect
+
+        cases = [
+            (PDFExtractor, 'doc.pdf', 'document_extractor.extractors.pdf.fitz.open'),
+            (PPTXExtractor, 'deck.pptx', 'document_extractor.extractors.pptx.zipfile.ZipFile'),
+            (DOCXExtractor, 'report.docx', 'document_extractor.extractors.docx.zipfile.ZipFile'),
+        ]
+        for extractor, name, target in cases:
+            path = self.temp_dir / name
+            with patch(target, side_effect=vanish(path)):
+                info = extractor.inspect(path)
+            self.assertFalse(info.opens, name)
+            self.assertGreater(info.file_size, 0, name)
+
+        info = PDFExtractor.inspect(self.temp_dir / 'doc.pdf')
+        self.assertIn("File not found", info.error)
+
+    def test_triage_documents(self):
+        """Test triage over a directory"""
+        results = {r['file_name']: r for r in self.processor.triage_documents(str(self.temp_dir))}
+        self.assertEqual(len(results), 4)
+        self.assertTrue(results['deck.pptx']['opens'])
+        self.assertFalse(results['broken.pdf']['opens'])
+        self.assertNotIn('content', results['doc.pdf'])
+
+
+class TestExtractionBudget(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = Path(tempfile.mkdtemp())
+        make_pdf(self.temp_dir / 'doc.pdf', 3)
+        make_pptx(self.temp_dir / 'deck.pptx', 4)
+        make_docx(self.temp_dir / 'report.docx', 5)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_clip(self):
+        """Test character and UTF-8 byte clipping"""
+        self.assertEqual(ExtractionBudget(max_chars=3).clip("abcdef"), ("abc", True))
+        self.assertEqual(ExtractionBudget(max_bytes=3).clip("ééé"), ("é", True))
+        self.assertEqual(ExtractionBudget(max_bytes=10).clip("abc"), ("abc", False))
+
+    def test_limits_must_be_positive(self):
+        """Test zero and negative limits are rejected"""
+        for limits in ({"max_pages": 0}, {"max_chars": -3}, {"max_bytes": 0}):
+            with self.assertRaises(ValueError):
+                ExtractionBudget(**limits)
+
+    def test_large_table_budget(self):
+        """Test the text budget stops reading inside a single large table"""
+        doc = Document()
+        table = doc.add_table(rows=200, cols=2)
+        for number, row in enumerate(table.rows):
+            row.cells[0].text = f"Row {number}"
+            row.cells[1].text = "value"
+        doc.save(str(self.temp_dir / 'table.docx'))
+
+        rows_read = []
+        cells = docx.table._Row.cells
+        with patch.object(docx.table._Row, 'cells', property(lambda row: rows_read.append(row) or cells.fget(row))):
+            result = DOCXExtractor.extract(self.temp_dir / 'table.docx', budget=ExtractionBudget(max_chars=50))
+
+        self.assertTrue(result.truncated)
+        self.assertLessEqual(len(result.content), 50)
+        self.assertLess(len(rows_read), 20)
+
+    def test_page_budget(self):
+        """Test max_pages stops PDF and PPTX extraction early"""
+        budget = ExtractionBudget(max_pages=2)
+
+        result = PDFExtractor.extract(self.temp_dir / 'doc.pdf', budget=budget)
+        self.assertTrue(result.truncated)
+        self.assertIn("Page 1", result.content)
+        self.assertNotIn("Page 2", result.content)
+
+        result = PPTXExtractor.extract(self.temp_dir / 'deck.pptx', budget=budget)
+        self.assertTrue(result.truncated)
+        self.assertEqual(result.content, "Slide 0 text\nSlide 1 text")
+
+        result = PDFExtractor.extract(self.temp_dir / 'doc.pdf', budget=ExtractionBudget(max_pages=3))
+        self.assertFalse(result.truncated)
+
+    def test_text_budget_in_processor(self):
+        """Test character budget is applied and reported by the processor"""
+        processor = DocumentProcessor(budget=ExtractionBudget(max_chars=20))
+        results = {r['file_name']: r for r in processor.process_documents(str(self.temp_dir))}
+
+        for result in results.values():
+            self.assertIsNone(result['error'])
+            self.assertTrue(result['truncated'])
+            self.assertLessEqual(len(result['content']), 20)
+
+        unlimited = {r['file_name']: r for r in DocumentProcessor().process_documents(str(self.temp_dir))}
+        self.assertFalse(unlimited['report.docx']['truncated'])
+        self.assertIn("Paragraph 4 text", unlimited['report.docx']['content'])
+
+
+if __name__ == '__main__':
+    unittest.main()